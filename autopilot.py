@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Tree-search autopilot for the dinosaur game
+
+Before deciding, the autopilot restores a snapshot of the game into a
+headless shadow game and plays out sequences of held actions (run, jump,
+duck) over a fixed horizon, keeping the plan that survives longest.
+Snapshots are small flat arrays, so each branch costs a restore and the
+frames it simulates; a search evaluates up to a few hundred branches.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+
+from dinosaur_game import Game, RUNNING, JUMP, DUCK, RELEASE, COLLISION_MODES
+
+NOOP = 0
+
+# Tried in this order; on ties the earlier action wins, so the autopilot
+# only jumps or ducks when it has to
+ACTIONS = (NOOP, DUCK, JUMP)
+
+
+def hold(game, action):
+    """Make the dinosaur do `action` from now on, issuing only the inputs needed"""
+    dino = game.dinosaur
+    if action != DUCK and dino.is_ducking:
+        game.apply_action(RELEASE)
+    if action == JUMP and not dino.is_jumping:
+        game.apply_action(JUMP)
+    elif action == DUCK and not dino.is_ducking and not dino.is_jumping:
+        game.apply_action(DUCK)
+
+
+class Autopilot:
+    """Controller for Game.simulate and Game.run that plans by lookahead search
+
+    Decisions are made every `interval` frames while the dinosaur is on the
+    ground, and again the moment it lands. Each searches `horizon` frames
+    ahead over plans that hold one action until the next decision, and
+    applies the first action of the plan that survives longest.
+    """
+
+    def __init__(self, horizon=60, interval=6, collision='discrete'):
+        self.horizon = horizon
+        self.interval = interval
+        self.shadow = Game(headless=True, collision=collision)
+        self.branches = 0  # plans evaluated, for reporting
+        self.action = NOOP
+        self.next_decision = 0
+
+    def __call__(self, game):
+        if game.dinosaur.is_jumping:
+            self.next_decision = game.frame  # decide again on landing
+            return
+        # The frame count goes back after a restart or rewind
+        if not 0 < self.next_decision - game.frame <= self.interval:
+            self.shadow.restore(game.snapshot())
+            self.action = self.search(self.horizon)[1]
+            self.next_decision = game.frame + self.interval
+        hold(game, self.action)
+
+    def play(self, frames):
+        # Advance the shadow up to `frames` frames, stopping early if it
+        # dies or lands; returns the frames played
+        shadow = self.shadow
+        dino = shadow.dinosaur
+        airborne = dino.is_jumping
+        for played in range(1, frames + 1):
+            shadow.update()
+            if shadow.state != RUNNING or (airborne and not dino.is_jumping):
+                return played
+        return frames
+
+    def search(self, frames):
+        # Returns (frames survived, first action) of the best plan for the
+        # next `frames` frames from the shadow's current state, with the
+        # dinosaur on the ground
+        shadow = self.shadow
+        start = shadow.snapshot()
+        best = (-1, NOOP)
+        for action in ACTIONS:
+            shadow.restore(start)
+            hold(shadow, action)
+            # A jump is one decision lasting until landing
+            survived = self.play(frames if shadow.dinosaur.is_jumping else min(self.interval, frames))
+            self.branches += 1
+            if shadow.state == RUNNING and survived < frames:
+                survived += self.search(frames - survived)[0]
+            if survived > best[0]:
+                best = (survived, action)
+                if survived == frames:
+                    break  # survives the whole horizon; nothing can do better
+        return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Let a lookahead search play the dinosaur game")
+    parser.add_argument('--headless', action='store_true', help="play episodes without a window and report scores")
+    parser.add_argument('--episodes', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--horizon', type=int, default=60, help="frames to look ahead")
+    parser.add_argument('--interval', type=int, default=6, help="frames between decisions on the ground")
+    parser.add_argument('--max-frames', type=int, default=20000)
+    parser.add_argument('--collision', choices=COLLISION_MODES, default='discrete')
+    args = parser.parse_args(argv)
+
+    autopilot = Autopilot(args.horizon, args.interval, args.collision)
+    if not args.headless:
+        Game(seed=args.seed, collision=args.collision).run(autopilot)
+        return
+
+    game = Game(headless=True, seed=args.seed, collision=args.collision)
+    scores = []
+    frames = 0
+    start = time.perf_counter()
+    for _ in range(args.episodes):
+        game.restart_game()
+        frames += game.simulate(args.max_frames, autopilot)
+        scores.append(game.score)
+    elapsed = time.perf_counter() - start
+    print(f"mean score: {statistics.fmean(scores):.0f} (min {min(scores)}, max {max(scores)})")
+    print(f"{autopilot.branches / frames:.1f} branches per frame, "
+          f"{autopilot.branches / elapsed:.0f} branches/s, {frames / elapsed:.0f} frames/s")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""
+Vectorized batch environment for the dinosaur game.
+
+Steps many independent games in lockstep. The state of every game lives in
+struct-of-arrays NumPy buffers, and the rules of Dinosaur.update,
+Obstacle.update, the spawn logic in Game.update and the colliderect test are
+applied as whole-array operations. Games that reach GAME_OVER are reset
+automatically.
+"""
+
+import numpy as np
+
+from dinosaur_game import SCREEN_WIDTH, SCREEN_HEIGHT, GROUND_HEIGHT
+
+# Actions
+NOOP = 0  # run (releases duck)
+JUMP = 1
+DUCK = 2
+
+# Obstacle types
+CACTUS = 0
+BIRD = 1
+
+# At most ~4 obstacles fit on screen at the slowest speed and spawn rate
+MAX_OBSTACLES = 8
+
+# Same values as Dinosaur, Obstacle and Game
+DINO_X = 100
+DINO_WIDTH = 40
+DINO_HEIGHT = 60
+DINO_DUCK_HEIGHT = 30
+DINO_GROUND_Y = SCREEN_HEIGHT - GROUND_HEIGHT - 60
+GRAVITY = 0.8
+JUMP_STRENGTH = -15
+BASE_SPEED = 8
+SPAWN_DELAY = 90
+MIN_SPAWN_DELAY = 30
+SPEED_UP_FRAMES = 300
+CACTUS_WIDTH = 20
+BIRD_WIDTH = 30
+BIRD_HEIGHT = 20
+
+
+class BatchEnv:
+    def __init__(self, num_games, seed=None):
+        n = num_games
+        self.num_games = n
+        self.rng = np.random.default_rng(seed)
+
+        # Dinosaur
+        self.dino_y = np.zeros(n)
+        self.dino_vy = np.zeros(n)
+        self.jumping = np.zeros(n, dtype=bool)
+        self.ducking = np.zeros(n, dtype=bool)
+
+        # Obstacles, one row of slots per game
+        shape = (n, MAX_OBSTACLES)
+        self.obs_x = np.zeros(shape)
+        self.obs_y = np.zeros(shape, dtype=np.int32)
+        self.obs_w = np.zeros(shape, dtype=np.int32)
+        self.obs_h = np.zeros(shape, dtype=np.int32)
+        self.obs_type = np.zeros(shape, dtype=np.int8)
+        self.obs_active = np.zeros(shape, dtype=bool)
+
+        # Timers, difficulty and score
+        self.score = np.zeros(n, dtype=np.int64)
+        self.high_score = np.zeros(n, dtype=np.int64)
+        self.speed = np.zeros(n)
+        self.speed_timer = np.zeros(n, dtype=np.int32)
+        self.spawn_timer = np.zeros(n, dtype=np.int32)
+        self.spawn_delay = np.zeros(n, dtype=np.int32)
+
+        self.reset()
+
+    def reset(self, mask=None):
+        # Reset all games, or only those selected by a boolean mask
+        if mask is None:
+            mask = np.ones(self.num_games, dtype=bool)
+        self.dino_y[mask] = DINO_GROUND_Y
+        self.dino_vy[mask] = 0
+        self.jumping[mask] = False
+        self.ducking[mask] = False
+        self.obs_active[mask] = False
+        self.score[mask] = 0
+        self.speed[mask] = BASE_SPEED
+        self.speed_timer[mask] = 0
+        self.spawn_timer[mask] = 0
+        self.spawn_delay[mask] = SPAWN_DELAY
+
+    def draw_spawns(self, count):
+        # Random choices for `count` new obstacles, as in Obstacle.__init__:
+        # type (two cacti for every bird), cactus height and bird altitude
+        types = np.where(self.rng.integers(0, 3, count) == 1, BIRD, CACTUS)
+        heights = self.rng.integers(40, 71, count)
+        altitudes = self.rng.integers(60, 121, count)
+        return types, heights, altitudes
+
+    def step(self, actions):
+        # Advance every game by one frame. Returns (rewards, dones, scores)
+        # where scores holds the final score of games that just ended; those
+        # games are already reset when step returns.
+        actions = np.asarray(actions)
+
+        # Input, as Dinosaur.jump / duck / stop_duck
+        self.ducking = (actions == DUCK) & ~self.jumping
+        takeoff = (actions == JUMP) & ~self.jumping
+        self.jumping |= takeoff
+        self.dino_vy[takeoff] = JUMP_STRENGTH
+
+        self.score += 1
+
+        # Progressive difficulty
+        self.speed_timer += 1
+        speed_up = self.speed_timer >= SPEED_UP_FRAMES
+        self.speed[speed_up] += 0.5
+        self.speed_timer[speed_up] = 0
+        self.spawn_delay[speed_up & (self.spawn_delay > MIN_SPAWN_DELAY)] -= 2
+
+        # Jumping physics
+        jumping = self.jumping
+        self.dino_vy[jumping] += GRAVITY
+        self.dino_y[jumping] += self.dino_vy[jumping]
+        landed = jumping & (self.dino_y >= DINO_GROUND_Y)
+        self.dino_y[landed] = DINO_GROUND_Y
+        self.dino_vy[landed] = 0
+        self.jumping &= ~landed
+
+        # Spawn obstacles into the first free slot
+        self.spawn_timer += 1
+        games = np.flatnonzero(self.spawn_timer >= self.spawn_delay)
+        if games.size:
+            slots = np.argmin(self.obs_active[games], axis=1)
+            types, heights, altitudes = self.draw_spawns(games.size)
+            is_bird = types == BIRD
+            height = np.where(is_bird, BIRD_HEIGHT, heights)
+            self.obs_x[games, slots] = SCREEN_WIDTH
+            self.obs_w[games, slots] = np.where(is_bird, BIRD_WIDTH, CACTUS_WIDTH)
+            self.obs_h[games, slots] = height
+            self.obs_y[games, slots] = SCREEN_HEIGHT - GROUND_HEIGHT - np.where(is_bird, altitudes, height)
+            self.obs_type[games, slots] = types
+            self.obs_active[games, slots] = True
+            self.spawn_timer[games] = 0
+
+        # Move obstacles and cull those that left the screen
+        self.obs_x -= self.speed[:, None]
+        self.obs_active &= self.obs_x + self.obs_w >= 0
+
+        # AABB collision with pygame.Rect semantics (coordinates truncated)
+        dino_h = np.where(self.ducking, DINO_DUCK_HEIGHT, DINO_HEIGHT)
+        dino_top = np.trunc(self.dino_y + (DINO_HEIGHT - dino_h))[:, None]
+        dino_bottom = dino_top + dino_h[:, None]
+        obs_left = np.trunc(self.obs_x)
+        hits = (self.obs_active
+                & (obs_left < DINO_X + DINO_WIDTH) & (obs_left + self.obs_w > DINO_X)
+                & (self.obs_y < dino_bottom) & (self.obs_y + self.obs_h > dino_top))
+        dones = hits.any(axis=1)
+
+        rewards = np.where(dones, 0.0, 1.0)
+        scores = np.where(dones, self.score, 0)
+        if dones.any():
+            np.maximum(self.high_score, scores, out=self.high_score)
+            self.reset(dones)
+        return rewards, dones, scores
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Frame-time benchmarks for the dinosaur game
+
+Times Game.update, Game.draw, Ground.update/draw, Dinosaur.draw and
+Obstacle.draw in isolation, and the whole frame end to end, under the SDL
+dummy video driver. Game-level benchmarks are swept over obstacle count,
+particle count and game speed. Each benchmark reports p50/p95/p99 frame
+times and the frames per second at the median.
+
+Results can be saved as a JSON baseline and compared against later runs on
+the same machine:
+
+    python benchmarks/frame_times.py --save baseline.json
+    python benchmarks/frame_times.py --compare baseline.json
+"""
+
+import os
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pygame
+
+from dinosaur_game import Game, Ground, Obstacle, RUNNING, SCREEN_WIDTH
+from quality import TIERS, TIER_NAMES, apply_tier
+
+DEFAULTS = {'obstacles': 4, 'particles': 50, 'speed': 8}
+SWEEPS = {
+    'obstacles': [0, 1, 4, 16],
+    'particles': [0, 50, 500, 2000],
+    'speed': [8, 20, 40],
+}
+
+
+def percentile(sorted_samples, fraction):
+    index = min(len(sorted_samples) - 1, int(fraction * len(sorted_samples)))
+    return sorted_samples[index]
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    p50 = percentile(samples, 0.50)
+    return {
+        'p50_ms': p50 * 1000,
+        'p95_ms': percentile(samples, 0.95) * 1000,
+        'p99_ms': percentile(samples, 0.99) * 1000,
+        'fps': 1 / p50 if p50 else float('inf'),
+        'samples': len(samples),
+    }
+
+
+def time_calls(func, setup, iterations, warmup):
+    # Run setup untimed before every call so the workload stays constant
+    samples = []
+    perf_counter = time.perf_counter
+    for i in range(warmup + iterations):
+        setup()
+        start = perf_counter()
+        func()
+        elapsed = perf_counter() - start
+        if i >= warmup:
+            samples.append(elapsed)
+    return summarize(samples)
+
+
+class Scenario:
+    """A rendered game held at a fixed obstacle count, particle count and speed
+
+    The game seeks to the first frame of the schedule at the requested
+    speed and is held there, so the speed and spawn rate are the ones a
+    real run has at that point.
+    """
+
+    def __init__(self, game, obstacles, particles, speed):
+        self.game = game
+        self.obstacles = obstacles
+        self.particles = particles
+        self.speed = speed
+        self.rng = random.Random(0)
+        game.restart_game(seed=0)
+        self.frame = game.schedule.frame_at_speed(speed)
+        game.seek(self.frame)
+
+    def setup(self):
+        game = self.game
+        # Keep the run alive: collisions are still tested, just not fatal
+        game.state = RUNNING
+        game.frame = self.frame
+        game.current_speed = game.schedule.speed(self.frame)
+        game.ground.speed = game.current_speed
+
+        if len(game.obstacles) > self.obstacles:
+            game.obstacles.clear()
+        while len(game.obstacles) < self.obstacles:
+            game.obstacles.spawn(self.rng.uniform(0, SCREEN_WIDTH), self.rng.choice(['cactus', 'bird']),
+                                 self.rng)
+
+        dust = game.ground.dust
+        while dust.count < min(self.particles, dust.capacity):
+            dust.emit(self.rng.uniform(0, SCREEN_WIDTH), self.rng.uniform(340, 350), 40)
+        dust.count = min(dust.count, self.particles)
+
+
+def game_benchmarks(game, iterations, warmup):
+    results = {}
+    for parameter, values in SWEEPS.items():
+        for value in values:
+            params = dict(DEFAULTS, **{parameter: value})
+            scenario = Scenario(game, **params)
+            label = ','.join(f'{key}={val}' for key, val in params.items())
+
+            def frame():
+                game.handle_events()
+                game.update()
+                game.draw()
+
+            for name, func in (('game.update', game.update), ('game.draw', game.draw),
+                               ('frame', frame)):
+                key = f'{name}[{label}]'
+                if key not in results:
+                    results[key] = time_calls(func, scenario.setup, iterations, warmup)
+    return results
+
+
+def component_benchmarks(game, iterations, warmup):
+    scenario = Scenario(game, **DEFAULTS)
+    scenario.setup()
+    screen = game.screen
+    ground = game.ground
+    dinosaur = game.dinosaur
+    rng = random.Random(1)
+    cactus = Obstacle(400, 'cactus', rng)
+    bird = Obstacle(500, 'bird', rng)
+
+    def advance():
+        scenario.setup()
+        dinosaur.update()
+        bird.update()
+        cactus.x = bird.x = 400
+
+    return {
+        'ground.update': time_calls(ground.update, scenario.setup, iterations, warmup),
+        'ground.draw': time_calls(lambda: ground.draw(screen), scenario.setup, iterations, warmup),
+        'dinosaur.draw': time_calls(lambda: dinosaur.draw(screen), advance, iterations, warmup),
+        'obstacle.draw[cactus]': time_calls(lambda: cactus.draw(screen), advance, iterations, warmup),
+        'obstacle.draw[bird]': time_calls(lambda: bird.draw(screen), advance, iterations, warmup),
+    }
+
+
+def metadata():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'commit': commit,
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'node': platform.node(),
+    }
+
+
+def compare(results, baseline, threshold):
+    # Returns the names of benchmarks whose p50 regressed past the threshold
+    regressions = []
+    print(f"\n{'benchmark':<52} {'base p50':>10} {'p50':>10} {'change':>8}")
+    for name, result in results.items():
+        base = baseline['results'].get(name)
+        if base is None:
+            continue
+        change = result['p50_ms'] / base['p50_ms'] - 1 if base['p50_ms'] else 0.0
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        print(f"{name:<52} {base['p50_ms']:>8.3f}ms {result['p50_ms']:>8.3f}ms {change:>+7.1%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dinosaur game frame times")
+    parser.add_argument('--iterations', type=int, default=1000)
+    parser.add_argument('--warmup', type=int, default=100)
+    parser.add_argument('--dirty-rects', action='store_true', help="benchmark the dirty-rect rendering path")
+    parser.add_argument('--quality', choices=TIER_NAMES, default='high', help="visual quality tier")
+    parser.add_argument('--save', metavar='PATH', help="write results as a JSON baseline")
+    parser.add_argument('--compare', metavar='PATH', help="compare against a JSON baseline")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="relative p50 slowdown reported as a regression (default 0.10)")
+    args = parser.parse_args(argv)
+
+    game = Game(seed=0, dirty_rects=args.dirty_rects, render_fps=0)
+    game.sounds_enabled = False
+    game.ground = Ground(random.Random(0), dust_capacity=max(SWEEPS['particles']))
+    apply_tier(game, TIERS[TIER_NAMES.index(args.quality)])
+
+    results = component_benchmarks(game, args.iterations, args.warmup)
+    results.update(game_benchmarks(game, args.iterations, args.warmup))
+    pygame.quit()
+
+    print(f"{'benchmark':<52} {'p50':>9} {'p95':>9} {'p99':>9} {'fps':>9}")
+    for name, result in results.items():
+        print(f"{name:<52} {result['p50_ms']:>7.3f}ms {result['p95_ms']:>7.3f}ms "
+              f"{result['p99_ms']:>7.3f}ms {result['fps']:>9.0f}")
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'meta': metadata(), 'results': results}, f, indent=2)
+        print(f"\nSaved baseline to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline['meta'].get('node') != platform.node():
+            print(f"\nWarning: baseline was recorded on {baseline['meta'].get('node')}, "
+                  f"not this machine")
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Spectator stream benchmark for the dinosaur game
+
+Plays a headless game in real time with a simple policy, first alone and
+then with a SpectatorServer and dozens of connected spectators, and reports
+what streaming costs the game thread (Game.update with and without
+publishing, and publish on its own) and the bandwidth: message sizes and
+bytes per second per spectator and in total. Spectators run on a reader
+thread that only collects bytes; their streams are decoded at the end and
+checked against the game's final state.
+
+Paced runs include the cost of waking up for every tick, which dominates
+on some machines; compare the two update rows, or use --rate 0 to time
+the work alone.
+"""
+
+import os
+import sys
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import argparse
+import selectors
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+from dinosaur_game import Game, RUNNING, SIM_RATE
+from rollout import jump_over_cacti
+from spectator import (MESSAGE, KEYFRAME, STATE_SIZE, SpectatorServer, StreamDecoder, connect,
+                       pack_state)
+
+
+def percentile(sorted_samples, fraction):
+    index = min(len(sorted_samples) - 1, int(fraction * len(sorted_samples)))
+    return sorted_samples[index]
+
+
+def play(game, ticks, rate):
+    """Run `ticks` updates paced at `rate` per second; returns per-update seconds
+    and per-publish seconds"""
+    updates = []
+    publishes = []
+    server = game.spectators
+    if server is not None:
+        # Time publish on its own by wrapping it
+        publish = server.publish
+
+        def timed_publish(game):
+            start = time.perf_counter()
+            publish(game)
+            publishes.append(time.perf_counter() - start)
+        server.publish = timed_publish
+
+    next_tick = time.perf_counter()
+    for _ in range(ticks):
+        if game.state == RUNNING:
+            jump_over_cacti(game)
+        else:
+            game.restart_game()
+        start = time.perf_counter()
+        game.update()
+        updates.append(time.perf_counter() - start)
+        if rate:
+            next_tick += 1 / rate
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+    return updates, publishes
+
+
+class Spectators:
+    """Sockets connected to a server, drained by a thread that keeps the bytes"""
+
+    def __init__(self, address, count):
+        self.sockets = [connect(address) for _ in range(count)]
+        self.streams = [bytearray() for _ in range(count)]
+        self.selector = selectors.DefaultSelector()
+        for i, sock in enumerate(self.sockets):
+            sock.setblocking(False)
+            self.selector.register(sock, selectors.EVENT_READ, i)
+        self.stopping = False
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while not self.stopping:
+            for key, _ in self.selector.select(0.05):
+                try:
+                    data = key.fileobj.recv(65536)
+                except BlockingIOError:
+                    continue
+                self.streams[key.data] += data
+
+    def close(self):
+        self.stopping = True
+        self.thread.join()
+        for sock in self.sockets:
+            sock.close()
+
+
+def message_sizes(stream):
+    """Sizes of the keyframes and deltas in a stream"""
+    keyframes = []
+    deltas = []
+    offset = 0
+    while offset < len(stream):
+        kind, _, length = MESSAGE.unpack_from(stream, offset)
+        size = MESSAGE.size + length
+        (keyframes if kind == KEYFRAME else deltas).append(size)
+        offset += size
+    return keyframes, deltas
+
+
+def summarize_ms(label, samples):
+    samples = sorted(samples)
+    print(f"{label:<32} p50 {percentile(samples, 0.5) * 1e3:7.3f}ms  "
+          f"p95 {percentile(samples, 0.95) * 1e3:7.3f}ms  p99 {percentile(samples, 0.99) * 1e3:7.3f}ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the spectator stream")
+    parser.add_argument('--spectators', type=int, default=48)
+    parser.add_argument('--seconds', type=float, default=10.0, help="game time per phase")
+    parser.add_argument('--rate', type=int, default=SIM_RATE, help="ticks per second, 0 for uncapped")
+    parser.add_argument('--address', default='127.0.0.1:0',
+                        help="host:port or unix:<path> to serve on (default a free local port)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    ticks = int(args.seconds * (args.rate or SIM_RATE))
+
+    game = Game(headless=True, seed=args.seed)
+    alone, _ = play(game, ticks, args.rate)
+
+    server = SpectatorServer(args.address).start()
+    if isinstance(server.address, tuple):
+        address = f"{server.address[0]}:{server.address[1]}"
+    else:
+        address = f"unix:{server.address}"
+    spectators = Spectators(address, args.spectators)
+    while len(server.clients) < args.spectators:
+        time.sleep(0.01)
+
+    game = Game(headless=True, seed=args.seed)
+    game.spectators = server
+    start = time.perf_counter()
+    streamed, publishes = play(game, ticks, args.rate)
+    elapsed = time.perf_counter() - start
+    time.sleep(0.2)  # let the last messages arrive
+    spectators.close()
+    server.stop()
+    if address.startswith('unix:'):
+        os.unlink(server.address)
+
+    # Every stream must decode to the game's final state
+    final = bytearray(STATE_SIZE)
+    game.spectators = None
+    pack_state(game, final)
+    final = np.frombuffer(bytes(final), dtype=np.uint8)
+    in_sync = 0
+    for stream in spectators.streams:
+        decoder = StreamDecoder()
+        decoder.feed(stream)
+        in_sync += decoder.state is not None and np.array_equal(decoder.state, final)
+
+    keyframes, deltas = message_sizes(spectators.streams[0])
+    total = sum(len(stream) for stream in spectators.streams)
+    print(f"{ticks} ticks at {args.rate or 'uncapped'} ticks/s, {args.spectators} spectators\n")
+    summarize_ms("update, no spectators", alone)
+    summarize_ms("update, streaming", streamed)
+    summarize_ms("publish", publishes)
+    print(f"\nmessages broadcast:   {server.messages} ({server.skipped} skipped for slow spectators)")
+    print(f"keyframe size:        {keyframes[0] if keyframes else 0} bytes ({len(keyframes)} sent)")
+    if deltas:
+        print(f"delta size:           mean {sum(deltas) / len(deltas):.1f} bytes, max {max(deltas)} "
+              f"({len(deltas)} sent)")
+    print(f"per spectator:        {total / args.spectators / elapsed / 1024:.2f} KiB/s")
+    print(f"total:                {total / elapsed / 1024:.1f} KiB/s")
+    print(f"streams in sync:      {in_sync}/{args.spectators}")
+    return 0 if in_sync == args.spectators else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
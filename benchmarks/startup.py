@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Cold start measurement for the dinosaur game
+
+Runs each scenario in a fresh interpreter and reports the median of several
+runs: how long `import dinosaur_game` takes, the time to the first simulated
+step of a headless game, and the time to the first rendered frame. Times are
+measured inside the child from just before the import, plus the wall time of
+the whole process including interpreter start-up.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    'import': '''
+import dinosaur_game
+''',
+    'first_step': '''
+import dinosaur_game
+game = dinosaur_game.Game(headless=True)
+game.update()
+''',
+    'first_frame': '''
+import dinosaur_game
+game = dinosaur_game.Game()
+game.update()
+game.draw()
+''',
+}
+
+CHILD = '''
+import time
+start = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - start
+import json, sys
+print(json.dumps({{"seconds": elapsed, "numpy_loaded": "numpy" in sys.modules}}))
+'''
+
+
+def measure(name, runs):
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT='1')
+    if 'DISPLAY' not in env and 'WAYLAND_DISPLAY' not in env:
+        env.setdefault('SDL_VIDEODRIVER', 'dummy')
+    env.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+    inside = []
+    wall = []
+    numpy_loaded = False
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, '-c', CHILD.format(body=SCENARIOS[name])],
+                                cwd=ROOT, env=env, capture_output=True, text=True, check=True).stdout
+        wall.append(time.perf_counter() - start)
+        result = json.loads(output.strip().splitlines()[-1])
+        inside.append(result['seconds'])
+        numpy_loaded = result['numpy_loaded']
+    return {
+        'median_ms': statistics.median(inside) * 1000,
+        'process_median_ms': statistics.median(wall) * 1000,
+        'numpy_loaded': numpy_loaded,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure dinosaur game cold start times")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    results = {name: measure(name, args.runs) for name in SCENARIOS}
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'scenario':<12} {'in-process':>12} {'with python':>12}  numpy")
+    for name, result in results.items():
+        print(f"{name:<12} {result['median_ms']:>10.1f}ms {result['process_median_ms']:>10.1f}ms  "
+              f"{'yes' if result['numpy_loaded'] else 'no'}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Off-thread gameplay capture for the dinosaur game
+
+FrameCapture takes each presented frame from Game.draw without stalling the
+game loop. The main thread only copies the canvas's 32-bit pixels into a
+free buffer from a preallocated ring, a row-by-row memcpy, and queues it. A
+writer thread converts the pixels to RGB and writes them out, either as
+one raw RGB stream or as a PNG sequence, with an index of the game frame and
+time of every captured frame.
+
+When the writer falls behind and no buffer is free, the frame is dropped
+rather than waited for. Each drop also halves the capture rate, down to
+1/max_stride, and the rate recovers as the writer empties the ring. The
+index shows what was kept.
+
+A raw stream is a small header followed by height x width x 3 byte frames,
+so load() can memory-map it as one array without reading it.
+"""
+
+import argparse
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+import zlib
+
+import numpy as np
+import pygame
+
+MAGIC = b'DCAP'
+VERSION = 1
+HEADER = struct.Struct('<4sBHH')  # magic, version, width, height
+
+# One record per captured frame: game frame and seconds since capture started
+INDEX_DTYPE = np.dtype([('frame', '<u4'), ('time', '<f8')])
+
+FORMATS = ('raw', 'png')
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+PNG_LEVEL = 1  # zlib level; captures are mostly flat colour and compress well anyway
+
+
+class CaptureError(ValueError):
+    pass
+
+
+def index_path(path, format='raw'):
+    return os.path.join(path, 'index.idx') if format == 'png' else path + '.idx'
+
+
+def _png_chunk(kind, data):
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(data, zlib.crc32(kind)))
+
+
+def encode_png(scanlines, width, height):
+    """A PNG of RGB scanlines, each a filter byte (0) followed by the row's pixels
+
+    Encoded here rather than with pygame.image.save because zlib releases
+    the GIL while it compresses, so the game loop keeps running meanwhile.
+    """
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)  # 8-bit RGB
+    return (PNG_SIGNATURE + _png_chunk(b'IHDR', header)
+            + _png_chunk(b'IDAT', zlib.compress(scanlines, PNG_LEVEL)) + _png_chunk(b'IEND', b''))
+
+
+class FrameCapture:
+    def __init__(self, path, size, format='raw', buffers=8, max_stride=8):
+        if format not in FORMATS:
+            raise CaptureError(f"Unknown capture format {format!r}")
+        self.path = path
+        self.size = size
+        self.format = format
+        width, height = size
+
+        # The ring: the main thread fills free buffers, the writer hands
+        # them back once written
+        self.buffers = [np.zeros((height, width), dtype=np.uint32) for _ in range(buffers)]
+        self.free = queue.SimpleQueue()
+        for slot in range(buffers):
+            self.free.put(slot)
+        self.ready = queue.SimpleQueue()
+
+        self.max_stride = max_stride
+        self.stride = 1  # capture every stride-th frame offered
+        self.offered = 0
+        self.captured = 0
+        self.skipped = 0  # left out by decimation
+        self.dropped = 0  # no free buffer
+        self.written = 0
+        self.start = time.perf_counter()
+        self.shifts = None
+
+        if format == 'png':
+            os.makedirs(path, exist_ok=True)
+            self.out = None
+        else:
+            self.out = open(path, 'wb')
+            self.out.write(HEADER.pack(MAGIC, VERSION, width, height))
+        self.index = open(index_path(path, format), 'wb')
+        self._thread = threading.Thread(target=self._run, name='frame-capture', daemon=True)
+        self._thread.start()
+
+    def add(self, surface, frame):
+        """Queue a copy of a 32-bit surface's pixels; returns False if the frame was not kept"""
+        self.offered += 1
+        if self.offered % self.stride:
+            self.skipped += 1
+            return False
+        if self.shifts is None:
+            if surface.get_bytesize() != 4:
+                raise CaptureError("frame capture needs a 32-bit surface")
+            self.shifts = surface.get_shifts()[:3]
+        try:
+            slot = self.free.get_nowait()
+        except queue.Empty:
+            # Writer is behind: drop this frame and capture less often
+            self.dropped += 1
+            self.stride = min(self.stride * 2, self.max_stride)
+            return False
+
+        # pixels2d is x-major over rows of the surface's pitch; its
+        # transpose is the buffer's layout, so this copies whole rows
+        pixels = pygame.surfarray.pixels2d(surface)
+        np.copyto(self.buffers[slot].T, pixels)
+        del pixels  # unlock the surface
+        self.ready.put((slot, frame, time.perf_counter() - self.start))
+        self.captured += 1
+        if self.stride > 1 and self.free.qsize() == len(self.buffers) - 1:
+            self.stride //= 2  # writer has caught up
+        return True
+
+    def close(self):
+        """Write out every queued frame and close the files"""
+        self.ready.put(None)
+        self._thread.join()
+        if self.out is not None:
+            self.out.close()
+        self.index.close()
+
+    def _run(self):
+        width, height = self.size
+        if self.out is not None:
+            rgb = np.empty((height, width, 3), dtype=np.uint8)
+        else:
+            # Rows of PNG scanlines, with the pixels after each filter byte
+            scanlines = np.zeros((height, 1 + 3 * width), dtype=np.uint8)
+            rgb = scanlines[:, 1:].reshape(height, width, 3)
+        channels = None
+        record = np.zeros(1, dtype=INDEX_DTYPE)
+        while True:
+            item = self.ready.get()
+            if item is None:
+                return
+            slot, frame, seconds = item
+            if channels is None:
+                # Byte of each 32-bit pixel holding red, green and blue
+                channels = [shift // 8 if sys.byteorder == 'little' else 3 - shift // 8
+                            for shift in self.shifts]
+            pixel_bytes = self.buffers[slot].view(np.uint8).reshape(height, width, 4)
+            for c, byte in enumerate(channels):
+                rgb[..., c] = pixel_bytes[..., byte]
+            self.free.put(slot)
+
+            if self.out is not None:
+                self.out.write(rgb.data)
+            else:
+                with open(os.path.join(self.path, f"frame_{self.written:06d}.png"), 'wb') as f:
+                    f.write(encode_png(scanlines, width, height))
+            record['frame'] = frame
+            record['time'] = seconds
+            self.index.write(record.tobytes())
+            self.written += 1
+
+
+def load(path):
+    """A raw capture as (frames, index): a read-only memory map of shape (n, height, width, 3)
+    and the index records"""
+    with open(path, 'rb') as f:
+        header = f.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise CaptureError("truncated capture header")
+    magic, version, width, height = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise CaptureError("not a dinosaur game capture")
+    if version != VERSION:
+        raise CaptureError(f"unsupported capture version {version}")
+
+    frame_size = width * height * 3
+    count = (os.path.getsize(path) - HEADER.size) // frame_size
+    index = np.fromfile(index_path(path), dtype=INDEX_DTYPE)[:count]
+    if count == 0:
+        return np.zeros((0, height, width, 3), dtype=np.uint8), index
+    frames = np.memmap(path, dtype=np.uint8, mode='r', offset=HEADER.size,
+                       shape=(count, height, width, 3))
+    return frames, index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect and export dinosaur game captures")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    info = commands.add_parser('info', help="show capture details")
+    info.add_argument('path')
+
+    export = commands.add_parser('export', help="write a raw capture out as a PNG sequence")
+    export.add_argument('path')
+    export.add_argument('directory')
+
+    args = parser.parse_args(argv)
+    frames, index = load(args.path)
+
+    if args.command == 'info':
+        count, height, width = frames.shape[:3]
+        print(f"size: {width}x{height}")
+        print(f"frames: {count}")
+        if count:
+            duration = index['time'][-1] - index['time'][0]
+            print(f"game frames: {index['frame'][0]}-{index['frame'][-1]}")
+            print(f"duration: {duration:.1f}s ({(count - 1) / duration if duration else 0:.1f} captured FPS)")
+        return
+
+    os.makedirs(args.directory, exist_ok=True)
+    height, width = frames.shape[1:3]
+    for i, frame in enumerate(frames):
+        image = pygame.image.frombuffer(np.ascontiguousarray(frame).data, (width, height), 'RGB')
+        pygame.image.save(image, os.path.join(args.directory, f"frame_{i:06d}.png"))
+    print(f"wrote {len(frames)} frames to {args.directory}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
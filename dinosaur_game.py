@@ -1,19 +1,23 @@
+import argparse
 import pygame
 import random
 import sys
 import os
 import math
+import time
+from array import array
+from collections import deque, namedtuple
 
-# Initialize Pygame
-pygame.init()
+from profiler import FrameProfiler, MetricsExporter
+from quality import TIERS, TIER_NAMES, QualityGovernor, apply_tier
+from presenter import SCALING_MODES, Presenter
+from schedule import SPAWN_CHOICES, Schedule
+from sprite_cache import MaskCache, SpriteCache
+from text_cache import TextCache
 
-# Try to import sound generator
-try:
-    from sounds.sound_generator import generate_jump_sound, generate_hit_sound, generate_point_sound
-    SOUNDS_AVAILABLE = True
-except ImportError:
-    SOUNDS_AVAILABLE = False
-    print("Sound generation not available. Running in silent mode.")
+# Importing this module has no side effects. pygame subsystems are started
+# by Game only when needed, and numpy-backed modules (particles, sounds) are
+# imported on first use.
 
 # Constants
 SCREEN_WIDTH = 800
@@ -21,6 +25,11 @@ SCREEN_HEIGHT = 400
 GROUND_HEIGHT = 50
 FPS = 60
 
+# The simulation advances in fixed ticks, independent of the render rate.
+# All physics constants are per tick.
+SIM_RATE = 60  # ticks per second
+MAX_CATCH_UP_TICKS = 5  # per rendered frame, before the game slows down
+
 # Colors
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -36,6 +45,30 @@ RED = (255, 0, 0)
 RUNNING = 0
 GAME_OVER = 1
 
+# Rendered sprites, shared by all characters. Sprites get this much
+# transparent margin around the hitbox for the parts drawn outside it.
+SPRITE_CACHE = SpriteCache()
+SPRITE_PAD = 20
+
+# Collision masks of the same sprites, for pixel-perfect collision
+MASK_CACHE = MaskCache(SPRITE_CACHE)
+
+# Player actions
+JUMP = 1
+DUCK = 2
+RELEASE = 3  # stop ducking
+
+# Collision tests: 'discrete' checks the hitboxes where they are after each
+# tick; 'swept' checks everywhere they passed through during the tick, so
+# fast obstacles cannot skip over the dinosaur; 'mask' checks the drawn
+# pixels, including the head, tail and spikes outside the hitboxes
+COLLISION_MODES = ('discrete', 'swept', 'mask')
+
+# Saved simulation state of a Game; see Game.snapshot
+Snapshot = namedtuple('Snapshot', 'values rng_state seed')
+OBSTACLE_TYPES = ('cactus', 'bird')
+OBSTACLE_STATE_SIZE = 7  # values per obstacle in a snapshot
+
 class Dinosaur:
     def __init__(self, x, y):
         self.x = x
@@ -52,6 +85,7 @@ class Dinosaur:
         self.duck_height = 30
         self.animation_frame = 0
         self.run_animation_speed = 0.2
+        self.prev_y = y  # position at the previous tick, for interpolation
         
     def jump(self):
         if not self.is_jumping and not self.is_ducking:
@@ -66,6 +100,8 @@ class Dinosaur:
         self.is_ducking = False
     
     def update(self):
+        self.prev_y = self.y
+        
         # Handle jumping physics
         if self.is_jumping:
             self.velocity_y += self.gravity
@@ -81,14 +117,47 @@ class Dinosaur:
         if not self.is_jumping:
             self.animation_frame += self.run_animation_speed
     
-    def get_rect(self):
+    def get_rect(self, y=None):
+        if y is None:
+            y = self.y
         if self.is_ducking:
-            return pygame.Rect(self.x, self.y + (self.height - self.duck_height), 
+            return pygame.Rect(self.x, y + (self.height - self.duck_height), 
                              self.width, self.duck_height)
-        return pygame.Rect(self.x, self.y, self.width, self.height)
+        return pygame.Rect(self.x, y, self.width, self.height)
+    
+    def pose(self):
+        # Sprite key of the current pose and the leg offset to draw it with;
+        # running poses are keyed by leg offset
+        if self.is_ducking:
+            return ('dino', 'duck'), 0
+        if self.is_jumping:
+            return ('dino', 'jump'), 0
+        leg_offset = int(math.sin(self.animation_frame) * 3)
+        return ('dino', 'run', leg_offset), leg_offset
+    
+    def draw(self, screen, alpha=1.0):
+        # alpha interpolates between the previous and current tick
+        rect = self.get_rect(self.prev_y + (self.y - self.prev_y) * alpha)
+        
+        # One sprite per pose
+        key, leg_offset = self.pose()
+        sprite = SPRITE_CACHE.get(key, (rect.width + 2 * SPRITE_PAD, rect.height + 2 * SPRITE_PAD),
+                                  self.draw_shape, leg_offset)
+        return screen.blit(sprite, (rect.x - SPRITE_PAD, rect.y - SPRITE_PAD))
     
-    def draw(self, screen):
+    def get_mask(self):
+        # Mask of the current pose and the bounds of its pixels, both
+        # relative to the sprite, which sits SPRITE_PAD above and left of
+        # the hitbox
+        key, leg_offset = self.pose()
+        width = self.width + 2 * SPRITE_PAD
+        height = (self.duck_height if self.is_ducking else self.height) + 2 * SPRITE_PAD
+        return MASK_CACHE.get(key, (width, height), self.draw_shape, leg_offset)
+    
+    def draw_shape(self, screen, leg_offset):
+        # Draw the current pose into a sprite, with the hitbox at SPRITE_PAD
         rect = self.get_rect()
+        rect.topleft = (SPRITE_PAD, SPRITE_PAD)
         
         # Draw dinosaur body
         if self.is_ducking:
@@ -111,7 +180,6 @@ class Dinosaur:
         
         # Draw legs with animation (simple running effect)
         if not self.is_jumping and not self.is_ducking:
-            leg_offset = int(math.sin(self.animation_frame) * 3)
             leg1_y = rect.y + rect.height
             leg2_y = rect.y + rect.height
             
@@ -133,34 +201,114 @@ class Dinosaur:
         pygame.draw.polygon(screen, DARK_GREEN, tail_points)
 
 class Obstacle:
-    def __init__(self, x, obstacle_type):
+    # Obstacles are pooled by ObstacleStore and reinitialised in place with
+    # reset(), so the attribute set is fixed
+    __slots__ = ('x', 'prev_x', 'type', 'width', 'height', 'y', 'color', 'spikes',
+                 'wing_animation', 'rect')
+    
+    def __init__(self, x, obstacle_type, rng=random):
+        self.rect = pygame.Rect(0, 0, 0, 0)  # hitbox, kept in step with x
+        self.reset(x, obstacle_type, rng)
+    
+    def reset(self, x, obstacle_type, rng=random):
         self.x = x
+        self.prev_x = x  # position at the previous tick, for interpolation
         self.type = obstacle_type  # 'cactus' or 'bird'
-        self.speed = 8
         
         if self.type == 'cactus':
             self.width = 20
-            self.height = random.randint(40, 70)
+            self.height = rng.randint(40, 70)
             self.y = SCREEN_HEIGHT - GROUND_HEIGHT - self.height
             self.color = GREEN
-            self.spikes = random.randint(3, 6)
+            self.spikes = rng.randint(3, 6)
+            self.wing_animation = 0
         else:  # bird
             self.width = 30
             self.height = 20
-            self.y = SCREEN_HEIGHT - GROUND_HEIGHT - random.randint(60, 120)  # Random flying height
+            self.y = SCREEN_HEIGHT - GROUND_HEIGHT - rng.randint(60, 120)  # Random flying height
             self.color = GRAY
+            self.spikes = 0
             self.wing_animation = 0
+        self.rect.update(int(x), self.y, self.width, self.height)
     
-    def update(self):
-        self.x -= self.speed
+    @classmethod
+    def from_state(cls, values, i):
+        # Obstacle saved by save_state at values[i]
+        obstacle = cls.__new__(cls)
+        obstacle.rect = pygame.Rect(0, 0, 0, 0)
+        obstacle.load_state(values, i)
+        return obstacle
+    
+    def save_state(self, values):
+        values.extend((self.x, self.prev_x, OBSTACLE_TYPES.index(self.type), self.height, self.y,
+                       self.spikes, self.wing_animation))
+    
+    def load_state(self, values, i):
+        self.x, self.prev_x, kind, height, y, spikes, self.wing_animation = \
+            values[i:i + OBSTACLE_STATE_SIZE]
+        self.type = OBSTACLE_TYPES[int(kind)]
+        self.height = int(height)
+        self.y = int(y)
+        self.spikes = int(spikes)
+        self.width = 20 if self.type == 'cactus' else 30
+        self.color = GREEN if self.type == 'cactus' else GRAY
+        self.rect.update(int(self.x), self.y, self.width, self.height)
+    
+    def update(self, speed=8):
+        # speed is the world speed, shared by every obstacle
+        self.prev_x = self.x
+        self.x -= speed
+        self.rect.x = int(self.x)
         if self.type == 'bird':
             self.wing_animation += 0.3
     
-    def get_rect(self):
-        return pygame.Rect(self.x, self.y, self.width, self.height)
+    def get_rect(self, x=None):
+        if x is None:
+            x = self.x
+        return pygame.Rect(x, self.y, self.width, self.height)
     
-    def draw(self, screen):
-        rect = self.get_rect()
+    def pose(self):
+        # Sprite key of the current look and the wing offsets to draw it
+        # with. Cacti are keyed by shape; birds by wing position, which is
+        # quantised to the whole pixels the wing ellipses land on
+        if self.type == 'cactus':
+            return ('cactus', self.height, self.spikes), None
+        wing_flap = math.sin(self.wing_animation) * 5
+        wing_offsets = (math.floor(wing_flap), math.floor(-wing_flap))
+        return ('bird',) + wing_offsets, wing_offsets
+    
+    def draw(self, screen, alpha=1.0, simple=False):
+        # alpha interpolates between the previous and current tick
+        x = int(self.prev_x + (self.x - self.prev_x) * alpha)
+        
+        if simple:
+            # Reduced detail: just the body, with no spikes or wings, in a
+            # sprite the size of the hitbox
+            sprite = SPRITE_CACHE.get((self.type, 'simple', self.height), (self.width, self.height),
+                                      self.draw_simple_shape)
+            return screen.blit(sprite, (x, self.y))
+        
+        key, wing_offsets = self.pose()
+        sprite = SPRITE_CACHE.get(key, (self.width + 2 * SPRITE_PAD, self.height + 2 * SPRITE_PAD),
+                                  self.draw_shape, wing_offsets)
+        return screen.blit(sprite, (x - SPRITE_PAD, self.y - SPRITE_PAD))
+    
+    def get_mask(self):
+        # Mask of the current look and the bounds of its pixels, both
+        # relative to the sprite
+        key, wing_offsets = self.pose()
+        return MASK_CACHE.get(key, (self.width + 2 * SPRITE_PAD, self.height + 2 * SPRITE_PAD),
+                              self.draw_shape, wing_offsets)
+    
+    def draw_simple_shape(self, screen):
+        if self.type == 'cactus':
+            pygame.draw.rect(screen, self.color, screen.get_rect(), border_radius=3)
+        else:
+            pygame.draw.ellipse(screen, self.color, screen.get_rect())
+    
+    def draw_shape(self, screen, wing_offsets):
+        # Draw this obstacle into a sprite, with the hitbox at SPRITE_PAD
+        rect = pygame.Rect(SPRITE_PAD, SPRITE_PAD, self.width, self.height)
         
         if self.type == 'cactus':
             # Draw cactus body
@@ -186,13 +334,13 @@ class Obstacle:
             pygame.draw.ellipse(screen, self.color, rect)
             
             # Draw animated wings
-            wing_flap = math.sin(self.wing_animation) * 5
+            left_flap, right_flap = wing_offsets
             # Left wing
             pygame.draw.ellipse(screen, BLACK, 
-                              (rect.x - 5, rect.y + 5 + wing_flap, 8, 10))
+                              (rect.x - 5, rect.y + 5 + left_flap, 8, 10))
             # Right wing
             pygame.draw.ellipse(screen, BLACK, 
-                              (rect.x + rect.width - 3, rect.y + 5 - wing_flap, 8, 10))
+                              (rect.x + rect.width - 3, rect.y + 5 + right_flap, 8, 10))
             
             # Draw beak
             pygame.draw.polygon(screen, ORANGE, [
@@ -201,102 +349,329 @@ class Obstacle:
                 (rect.x + rect.width + 8, rect.y + rect.height//2 + 2)
             ])
 
-class Ground:
+class ObstacleStore:
+    # Live obstacles in x order. They all spawn at the right edge and move
+    # at the world speed, so spawn order is x order and the leftmost
+    # obstacle is always at the front, where culling pops it in O(1).
+    # Culled obstacles go to a free list and are reset in place on the next
+    # spawn, so a long run allocates no obstacles or Rects once warmed up.
     def __init__(self):
+        self.active = deque()
+        self.free = []
+    
+    def __len__(self):
+        return len(self.active)
+    
+    def __iter__(self):
+        return iter(self.active)
+    
+    def __getitem__(self, index):
+        return self.active[index]
+    
+    def spawn(self, x, obstacle_type, rng=random):
+        if self.free:
+            obstacle = self.free.pop()
+            obstacle.reset(x, obstacle_type, rng)
+        else:
+            obstacle = Obstacle(x, obstacle_type, rng)
+        
+        active = self.active
+        if not active or x >= active[-1].x:
+            active.append(obstacle)
+        else:
+            # Placed out of order (benchmarks, tools): insert to keep x order
+            index = next(i for i, other in enumerate(active) if other.x > x)
+            active.insert(index, obstacle)
+        return obstacle
+    
+    def update(self, speed):
+        for obstacle in self.active:
+            obstacle.update(speed)
+        self.cull()
+    
+    def cull(self):
+        # Drop obstacles that left the screen
+        active = self.active
+        while active and active[0].x + active[0].width < 0:
+            self.free.append(active.popleft())
+    
+    def clear(self):
+        self.free.extend(self.active)
+        self.active.clear()
+    
+    def load_state(self, values, start, count):
+        # Replace the live obstacles with `count` saved ones starting at
+        # values[start], reusing pooled instances
+        self.clear()
+        for i in range(start, start + count * OBSTACLE_STATE_SIZE, OBSTACLE_STATE_SIZE):
+            if self.free:
+                obstacle = self.free.pop()
+                obstacle.load_state(values, i)
+            else:
+                obstacle = Obstacle.from_state(values, i)
+            self.active.append(obstacle)
+
+def sweep_interval(start, end, low, high):
+    # Times in [0, 1] at which a value moving linearly from start to end is
+    # strictly between low and high, as (enter, exit); empty if enter >= exit
+    if start == end:
+        return (0.0, 1.0) if low < start < high else (1.0, 0.0)
+    t_low = (low - start) / (end - start)
+    t_high = (high - start) / (end - start)
+    if t_low > t_high:
+        t_low, t_high = t_high, t_low
+    return max(t_low, 0.0), min(t_high, 1.0)
+
+def dust_color(life):
+    alpha = life / 40.0
+    return (139 + int(50 * alpha), 69 + int(50 * alpha), 19 + int(50 * alpha))
+
+class ScrollingStrip:
+    # A horizontally repeating layer, pre-rendered once. The strip holds
+    # enough copies of the tile to cover the screen plus one tile, so a
+    # single blit at the scroll offset fills the screen width.
+    def __init__(self, tile, y, parallax=1.0):
+        self.tile_width = tile.get_width()
+        self.y = y
+        self.parallax = parallax
         self.x = 0
+        self.prev_x = 0  # offset at the previous tick, unwrapped
+        
+        copies = -(-SCREEN_WIDTH // self.tile_width) + 1
+        flags = tile.get_flags() & pygame.SRCALPHA
+        self.surface = pygame.Surface((self.tile_width * copies, tile.get_height()), flags)
+        for i in range(copies):
+            self.surface.blit(tile, (i * self.tile_width, 0))
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert_alpha() if flags else self.surface.convert()
+    
+    def scroll(self, dx):
+        self.prev_x = self.x
+        self.x -= dx * self.parallax
+        if self.x <= -self.tile_width:
+            wrapped = self.x % -self.tile_width
+            self.prev_x += wrapped - self.x
+            self.x = wrapped
+    
+    def draw(self, screen, alpha=1.0):
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        return screen.blit(self.surface, (int(x), self.y))
+
+class Ground:
+    # The ground texture repeats every tile; texture lines are spaced 20px
+    # apart and rocks are laid out once per tile
+    TILE_WIDTH = SCREEN_WIDTH
+    
+    def __init__(self, rng=None, dust_rate=0.1, dust_capacity=256):
+        # Dust and rocks are purely visual, so they get their own generator
+        # and never disturb the simulation's random sequence
+        self.rng = rng or random.Random()
         self.speed = 8
-        self.dust_particles = []
+        self.base_dust_rate = dust_rate
+        self.dust_rate = dust_rate  # new particles per frame, on average
+        self.texture = True  # False draws the ground flat, without lines or rocks
+        from particles import ParticlePool  # deferred: pulls in numpy
+        self.dust = ParticlePool(dust_capacity, 40, 2, dust_color)
+        self.strip = ScrollingStrip(self.render_tile(), SCREEN_HEIGHT - GROUND_HEIGHT)
+        self.layers = []  # parallax layers drawn behind the ground
+    
+    def render_tile(self):
+        tile = pygame.Surface((self.TILE_WIDTH, GROUND_HEIGHT))
+        tile.fill(BROWN)
+        
+        # Draw ground pattern with more detail
+        for x in range(0, self.TILE_WIDTH, 20):
+            # Draw ground texture lines
+            pygame.draw.line(tile, BLACK, (x, 0), (x + 10, 5), 2)
+            # Draw small rocks, also drawn one tile to the left so rocks
+            # crossing the tile edge wrap around seamlessly
+            if self.rng.randint(1, 20) == 1:
+                rock_size = self.rng.randint(2, 4)
+                rock_x = x + self.rng.randint(0, 20)
+                rock_y = self.rng.randint(5, 15)
+                for wrap in (0, -self.TILE_WIDTH):
+                    pygame.draw.circle(tile, GRAY, (rock_x + wrap, rock_y), rock_size)
+        return tile
+    
+    def add_parallax_layer(self, tile, y, parallax):
+        # Layers scroll at `parallax` times the ground speed
+        layer = ScrollingStrip(tile, y, parallax)
+        self.layers.append(layer)
+        return layer
         
     def update(self):
-        self.x -= self.speed
-        if self.x <= -20:
-            self.x = 0
+        self.strip.scroll(self.speed)
+        for layer in self.layers:
+            layer.scroll(self.speed)
         
         # Update dust particles
-        for particle in self.dust_particles[:]:
-            particle['x'] -= self.speed
-            particle['life'] -= 1
-            if particle['life'] <= 0 or particle['x'] < 0:
-                self.dust_particles.remove(particle)
+        self.dust.update(self.speed)
         
         # Add new dust particles randomly
-        if random.randint(1, 10) == 1:
-            self.dust_particles.append({
-                'x': SCREEN_WIDTH + random.randint(0, 50),
-                'y': SCREEN_HEIGHT - GROUND_HEIGHT - random.randint(0, 10),
-                'life': random.randint(20, 40)
-            })
-    
-    def draw(self, screen):
-        # Draw ground
-        ground_rect = pygame.Rect(0, SCREEN_HEIGHT - GROUND_HEIGHT, SCREEN_WIDTH, GROUND_HEIGHT)
-        pygame.draw.rect(screen, BROWN, ground_rect)
+        count = int(self.dust_rate)
+        if self.rng.random() < self.dust_rate - count:
+            count += 1
+        for _ in range(count):
+            self.dust.emit(SCREEN_WIDTH + self.rng.randint(0, 50),
+                           SCREEN_HEIGHT - GROUND_HEIGHT - self.rng.randint(0, 10),
+                           self.rng.randint(20, 40))
+    
+    def draw(self, screen, alpha=1.0):
+        # Returns the rects drawn to
+        rects = [layer.draw(screen, alpha) for layer in self.layers]
         
-        # Draw ground pattern with more detail
-        for i in range(0, SCREEN_WIDTH + 40, 20):
-            x = (i + self.x) % (SCREEN_WIDTH + 40)
-            if x < SCREEN_WIDTH:
-                # Draw ground texture lines
-                pygame.draw.line(screen, BLACK, (x, SCREEN_HEIGHT - GROUND_HEIGHT), 
-                               (x + 10, SCREEN_HEIGHT - GROUND_HEIGHT + 5), 2)
-                # Draw small rocks
-                if random.randint(1, 20) == 1:
-                    rock_size = random.randint(2, 4)
-                    pygame.draw.circle(screen, GRAY, 
-                                     (x + random.randint(0, 20), 
-                                      SCREEN_HEIGHT - GROUND_HEIGHT + random.randint(5, 15)), 
-                                     rock_size)
+        # Draw ground
+        if self.texture:
+            rects.append(self.strip.draw(screen, alpha))
+        else:
+            rects.append(screen.fill(BROWN, (0, SCREEN_HEIGHT - GROUND_HEIGHT, SCREEN_WIDTH, GROUND_HEIGHT)))
         
         # Draw dust particles
-        for particle in self.dust_particles:
-            alpha = particle['life'] / 40.0
-            dust_color = (139 + int(50 * alpha), 69 + int(50 * alpha), 19 + int(50 * alpha))
-            pygame.draw.circle(screen, dust_color, 
-                             (int(particle['x']), int(particle['y'])), 2)
+        dust_rect = self.dust.draw(screen)
+        if dust_rect is not None:
+            rects.append(dust_rect)
+        return rects
 
 class Game:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Dinosaur Game")
-        self.clock = pygame.time.Clock()
+    def __init__(self, headless=False, seed=None, dirty_rects=False, render_fps=FPS, profile=False,
+                 collision='discrete', quality='high', scaling='none', fullscreen=False, window_size=None):
+        # Headless games only simulate: no window, fonts, sounds or frame cap
+        self.headless = headless
+        
+        # The scene is always drawn at SCREEN_WIDTH x SCREEN_HEIGHT; the
+        # presenter scales it to the window (see presenter.SCALING_MODES)
+        if scaling not in SCALING_MODES:
+            raise ValueError(f"Unknown scaling mode {scaling!r}")
+        self.presenter = None
+        
+        # Visual detail: one of quality.TIERS, or 'auto' to let a governor
+        # pick the tier from measured frame times
+        if quality != 'auto' and quality not in TIER_NAMES:
+            raise ValueError(f"Unknown quality {quality!r}")
+        self.quality = TIERS[0] if quality == 'auto' else TIERS[TIER_NAMES.index(quality)]
+        self.governor = None
+        
+        # One of COLLISION_MODES; runs only replay identically in the mode
+        # they were played in
+        if collision not in COLLISION_MODES:
+            raise ValueError(f"Unknown collision mode {collision!r}")
+        self.collision = collision
+        
+        # In dirty-rect mode only the regions that changed are pushed to the
+        # display, except on frames where the whole background changes
+        self.dirty_rects = dirty_rects
+        self.drawn_rects = []
+        self.drawn_sky_color = None
+        self.drawn_state = None
+        
+        # Frames per second to render at; 0 renders as fast as possible
+        self.render_fps = render_fps
+        
+        # Per-phase frame timings, only recorded when profiling is on
+        self.profiler = FrameProfiler() if profile else None
+        self.show_profiler = False  # frame-time graph overlay, toggled with F3
+        
+        # Optional capture.FrameCapture that every presented frame is handed to
+        self.capture = None
+        
+        # Optional spectator.SpectatorServer that every tick's state is published to
+        self.spectators = None
+        
+        # Optional persistence.ScoreStore that every finished run is recorded in
+        self.scores = None
+        
+        # All simulation randomness comes from one seeded generator, so a
+        # run is fully determined by its seed and its inputs
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.rng = random.Random(self.seed)
+        self.rng_state = None  # cached rng.getstate() for snapshots; cleared on every draw
         
         # Game objects
         self.dinosaur = Dinosaur(100, SCREEN_HEIGHT - GROUND_HEIGHT - 60)
-        self.ground = Ground()
-        self.obstacles = []
+        self.ground = None  # purely visual, created by the rendering layer
+        self.obstacles = ObstacleStore()
         
         # Game state
         self.state = RUNNING
+        self.death_cause = None  # type of the obstacle that ended the run
+        self.frame = 0  # updates since the run started
+        self.input_log = []  # (frame, action) pairs, for replays
         self.score = 0
         self.high_score = 0
-        self.speed_increase_timer = 0
         self.obstacle_spawn_timer = 0
-        self.obstacle_spawn_delay = 90  # frames
-        self.base_speed = 8
-        self.current_speed = self.base_speed
+        
+        # Speed, spawn delay and sky colour are functions of the frame
+        self.schedule = Schedule()
+        self.base_speed = self.schedule.base_speed
+        self.current_speed = self.schedule.speed(0)
+        self.obstacle_spawn_delay = self.schedule.spawn_delay(0)  # frames
         
         # Visual effects
-        self.day_night_cycle = 0
         self.sky_color = BLUE
         
+        # Sounds are loaded on first use; headless games have none
+        self.sounds = {}
+        self.sounds_enabled = False
+        self.screen = None
+        self.clock = None
+        self.font = None
+        self.small_font = None
+        self.text = None
+        if headless:
+            return
+        
+        # Rendering layer: only the display and font subsystems; the mixer
+        # starts on demand
+        pygame.display.init()
+        pygame.font.init()
+        self.presenter = Presenter((SCREEN_WIDTH, SCREEN_HEIGHT), scaling, fullscreen, window_size)
+        self.screen = self.presenter.canvas
+        pygame.display.set_caption("Dinosaur Game")
+        self.clock = pygame.time.Clock()
+        self.ground = Ground(random.Random(self.seed))
+        
         # Font for text
         self.font = pygame.font.Font(None, 36)
         self.small_font = pygame.font.Font(None, 24)
+        self.text = TextCache()
         
-        # Load sounds
-        self.sounds = {}
-        if SOUNDS_AVAILABLE:
+        # Game over overlay, composited once
+        self.overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.overlay.set_alpha(128)
+        self.overlay.fill(BLACK)
+        
+        apply_tier(self, self.quality)
+        if quality == 'auto':
+            self.governor = QualityGovernor(self)
+        
+        self.sounds_enabled = True
+    
+    def init_audio(self):
+        if pygame.mixer.get_init() is None:
             try:
-                self.sounds['jump'] = generate_jump_sound()
-                self.sounds['hit'] = generate_hit_sound()
-                self.sounds['point'] = generate_point_sound()
-                print("Sounds loaded successfully")
-            except Exception as e:
-                print(f"Could not load sounds: {e}")
-                self.sounds = {}
+                pygame.mixer.init()
+            except pygame.error as e:
+                print(f"Could not start audio: {e}")
+                self.sounds_enabled = False
+    
+    def load_sound(self, sound_name):
+        # Deferred import: the sound generator pulls in numpy
+        try:
+            from sounds.sound_generator import load_sound
+        except ImportError:
+            print("Sound generation not available. Running in silent mode.")
+            self.sounds_enabled = False
+            return None
+        return load_sound(sound_name)
         
     def play_sound(self, sound_name):
-        if sound_name in self.sounds and self.sounds[sound_name]:
+        if not self.sounds_enabled:
+            return
+        if sound_name not in self.sounds:
+            # Load lazily so startup does not pay for audio
+            self.init_audio()
+            self.sounds[sound_name] = self.load_sound(sound_name) if self.sounds_enabled else None
+        if self.sounds[sound_name]:
             try:
                 self.sounds[sound_name].play()
             except:
@@ -308,167 +683,520 @@ class Game:
                 return False
             
             if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F3:
+                    if self.profiler is None:
+                        self.profiler = FrameProfiler()
+                    self.show_profiler = not self.show_profiler
+                
                 if self.state == RUNNING:
                     if event.key == pygame.K_SPACE:
-                        self.dinosaur.jump()
-                        self.play_sound('jump')
+                        self.apply_action(JUMP)
                     elif event.key == pygame.K_c:
-                        self.dinosaur.duck()
+                        self.apply_action(DUCK)
                 elif self.state == GAME_OVER:
                     if event.key == pygame.K_SPACE:
                         self.restart_game()
             
             if event.type == pygame.KEYUP:
                 if event.key == pygame.K_c:
-                    self.dinosaur.stop_duck()
+                    self.apply_action(RELEASE)
+            
+            if event.type == pygame.VIDEOEXPOSE:
+                self.drawn_sky_color = None  # force a full redraw
+            
+            if event.type == pygame.VIDEORESIZE:
+                self.presenter.layout()
+                self.drawn_sky_color = None
         
         return True
     
+    def apply_action(self, action):
+        # Actions take effect before the next update and are logged with
+        # the frame they were applied on, so replays can reproduce them
+        self.input_log.append((self.frame, action))
+        if action == JUMP:
+            self.dinosaur.jump()
+            self.play_sound('jump')
+        elif action == DUCK:
+            self.dinosaur.duck()
+        elif action == RELEASE:
+            self.dinosaur.stop_duck()
+    
     def update(self):
         if self.state == RUNNING:
+            self.frame += 1
+            
             # Update score
             self.score += 1
             
             # Progressive difficulty
-            self.speed_increase_timer += 1
-            if self.speed_increase_timer >= 300:  # Every 5 seconds
-                self.current_speed += 0.5
-                self.speed_increase_timer = 0
-                if self.obstacle_spawn_delay > 30:
-                    self.obstacle_spawn_delay -= 2
-            
-            # Update day/night cycle
-            self.day_night_cycle += 0.02
-            cycle_pos = (math.sin(self.day_night_cycle) + 1) / 2
-            
-            # Interpolate sky color from day to night
-            day_r, day_g, day_b = BLUE
-            night_r, night_g, night_b = (25, 25, 112)  # Midnight blue
-            
-            self.sky_color = (
-                int(day_r + (night_r - day_r) * cycle_pos),
-                int(day_g + (night_g - day_g) * cycle_pos),
-                int(day_b + (night_b - day_b) * cycle_pos)
-            )
+            self.current_speed = self.schedule.speed(self.frame)
+            self.obstacle_spawn_delay = self.schedule.spawn_delay(self.frame)
             
             # Update game objects
             self.dinosaur.update()
-            self.ground.speed = self.current_speed
-            self.ground.update()
+            
+            # Sky and ground are purely visual, so games without a ground
+            # (headless ones, unless something renders them offscreen) skip them
+            if self.ground is not None:
+                self.update_visuals()
             
             # Play point sound every 100 points
             if self.score > 0 and self.score % 100 == 0:
                 self.play_sound('point')
             
+            prof = self.profiler
+            if prof:
+                t = time.perf_counter()
+            
             # Spawn obstacles
             self.obstacle_spawn_timer += 1
             if self.obstacle_spawn_timer >= self.obstacle_spawn_delay:
-                obstacle_type = random.choice(['cactus', 'bird', 'cactus'])  # More cacti than birds
-                new_obstacle = Obstacle(SCREEN_WIDTH, obstacle_type)
-                new_obstacle.speed = self.current_speed
-                self.obstacles.append(new_obstacle)
+                self.spawn_obstacle()
                 self.obstacle_spawn_timer = 0
+            if prof:
+                t = prof.lap('update.spawn', t)
             
             # Update obstacles
-            for obstacle in self.obstacles[:]:
-                obstacle.speed = self.current_speed
-                obstacle.update()
-                if obstacle.x + obstacle.width < 0:
-                    self.obstacles.remove(obstacle)
+            self.obstacles.update(self.current_speed)
+            if prof:
+                t = prof.lap('update.obstacles', t)
             
             # Check collisions
-            dinosaur_rect = self.dinosaur.get_rect()
-            for obstacle in self.obstacles:
-                if dinosaur_rect.colliderect(obstacle.get_rect()):
-                    self.state = GAME_OVER
-                    self.play_sound('hit')
-                    if self.score > self.high_score:
-                        self.high_score = self.score
+            for obstacle in self.collisions():
+                self.state = GAME_OVER
+                self.death_cause = obstacle.type
+                self.play_sound('hit')
+                if self.score > self.high_score:
+                    self.high_score = self.score
+            if prof:
+                prof.lap('update.collision', t)
+            if self.state == GAME_OVER:
+                self.record_run()
+        
+        if self.spectators is not None:
+            self.spectators.publish(self)
     
-    def draw(self):
-        # Clear screen with dynamic sky color
-        self.screen.fill(self.sky_color)
+    def collisions(self):
+        # Obstacles hitting the dinosaur this tick, in x order. Obstacles
+        # are sorted by x, so only those reaching the dinosaur's column are
+        # tested and the scan stops at the first one still right of it.
+        dino_rect = self.dinosaur.get_rect()
+        left = dino_rect.left
+        right = dino_rect.right
         
-        if self.state == RUNNING:
-            # Draw game objects
-            self.ground.draw(self.screen)
-            self.dinosaur.draw(self.screen)
-            
+        if self.collision == 'discrete':
+            for obstacle in self.obstacles:
+                if obstacle.rect.left >= right:
+                    break
+                if dino_rect.colliderect(obstacle.rect):
+                    yield obstacle
+            return
+        
+        if self.collision == 'mask':
+            # Masks are only compared once the bounds of the drawn pixels
+            # overlap, which is rare, so this costs little more than discrete
+            dino_mask, dino_bounds = self.dinosaur.get_mask()
+            dino_x = left - SPRITE_PAD
+            dino_y = dino_rect.top - SPRITE_PAD
+            dino_box = dino_bounds.move(dino_x, dino_y)
             for obstacle in self.obstacles:
-                obstacle.draw(self.screen)
+                obstacle_x = obstacle.rect.left - SPRITE_PAD
+                if obstacle_x >= dino_box.right:
+                    break
+                obstacle_y = obstacle.y - SPRITE_PAD
+                mask, bounds = obstacle.get_mask()
+                if not dino_box.colliderect(bounds.move(obstacle_x, obstacle_y)):
+                    continue
+                if dino_mask.overlap(mask, (obstacle_x - dino_x, obstacle_y - dino_y)):
+                    yield obstacle
+            return
+        
+        # Swept: over the tick the dinosaur moves vertically from its
+        # previous hitbox to its current one and each obstacle moves
+        # horizontally, both in a straight line. They collide if their
+        # overlaps on the two axes happen at the same time.
+        dino = self.dinosaur
+        top_start = int(dino.prev_y) + (dino_rect.top - int(dino.y))
+        top_end = dino_rect.top
+        for obstacle in self.obstacles:
+            obstacle_left = obstacle.rect.left
+            if obstacle_left >= right:
+                break
+            prev_left = int(obstacle.prev_x)
+            if prev_left + obstacle.width <= left:
+                continue  # passed the dinosaur before this tick
             
+            x_enter, x_exit = sweep_interval(left - prev_left, left - obstacle_left,
+                                             -dino_rect.width, obstacle.width)
+            y_enter, y_exit = sweep_interval(top_start - obstacle.y, top_end - obstacle.y,
+                                             -dino_rect.height, obstacle.height)
+            if max(x_enter, y_enter) < min(x_exit, y_exit):
+                yield obstacle
+    
+    def spawn_obstacle(self):
+        obstacle = self.obstacles.spawn(SCREEN_WIDTH, self.rng.choice(SPAWN_CHOICES), self.rng)
+        self.rng_state = None
+        return obstacle
+    
+    def update_visuals(self):
+        # Interpolate sky color from day to night; lower quality tiers
+        # change it less often
+        if self.frame % self.quality.sky_interval == 0:
+            self.sky_color = self.schedule.sky_color(self.frame)
+        
+        self.ground.speed = self.current_speed
+        self.ground.update()
+    
+    def simulate(self, max_frames, controller=None):
+        # Step the simulation as fast as the CPU allows, without drawing or
+        # frame capping. The optional controller is called with the game
+        # before every frame. Stops at game over; returns frames simulated.
+        frames = 0
+        while frames < max_frames and self.state == RUNNING:
+            if controller is not None:
+                controller(self)
+            self.update()
+            frames += 1
+        return frames
+    
+    def draw(self, alpha=1.0):
+        prof = self.profiler
+        if prof:
+            t = time.perf_counter()
+        
+        full_redraw = (not self.dirty_rects
+                       or self.sky_color != self.drawn_sky_color
+                       or self.state != self.drawn_state)
+        
+        if full_redraw:
+            # Clear screen with dynamic sky color
+            self.screen.fill(self.sky_color)
+        elif self.state == GAME_OVER:
+            return  # the game over screen is static
+        else:
+            # Erase everything drawn last frame
+            for rect in self.drawn_rects:
+                self.screen.fill(self.sky_color, rect)
+        
+        rects = self.draw_scene(alpha)
+        if prof:
+            t = prof.lap('draw', t)
+        
+        if full_redraw:
+            self.presenter.present()
+        else:
+            self.presenter.present(self.drawn_rects + rects)
+        if prof:
+            t = prof.lap('present', t)
+        if self.capture is not None:
+            self.capture.add(self.screen, self.frame)
+            if prof:
+                prof.lap('capture', t)
+        self.drawn_rects = rects
+        self.drawn_sky_color = self.sky_color
+        self.drawn_state = self.state
+    
+    def draw_scene(self, alpha=1.0, hud=True):
+        # Draw everything over the sky; returns the rects drawn to. alpha
+        # places moving objects between the previous and current tick.
+        # Without the HUD no text is drawn, so no fonts are needed.
+        prof = self.profiler
+        if prof:
+            t = time.perf_counter()
+        
+        rects = self.ground.draw(self.screen, alpha)
+        if prof:
+            t = prof.lap('draw.ground', t)
+        rects.append(self.dinosaur.draw(self.screen, alpha))
+        if prof:
+            t = prof.lap('draw.dino', t)
+        
+        simple = self.quality.simple_obstacles
+        for obstacle in self.obstacles:
+            rects.append(obstacle.draw(self.screen, alpha, simple))
+        if prof:
+            t = prof.lap('draw.obstacles', t)
+        if not hud:
+            return rects
+        
+        text = self.text
+        if self.state == RUNNING:
             # Draw score
-            score_text = self.font.render(f"Score: {self.score}", True, BLACK)
-            self.screen.blit(score_text, (10, 10))
-            
-            high_score_text = self.small_font.render(f"High Score: {self.high_score}", True, BLACK)
-            self.screen.blit(high_score_text, (10, 50))
+            rects.append(text.draw(self.screen, self.font, "Score: ", str(self.score), BLACK, (10, 10)))
+            rects.append(text.draw(self.screen, self.small_font, "High Score: ", str(self.high_score),
+                                   BLACK, (10, 50)))
             
             # Draw speed indicator
-            speed_text = self.small_font.render(f"Speed: {self.current_speed:.1f}", True, BLACK)
-            self.screen.blit(speed_text, (10, 75))
+            rects.append(text.draw(self.screen, self.small_font, "Speed: ", f"{self.current_speed:.1f}",
+                                   BLACK, (10, 75)))
             
             # Draw controls hint
-            controls_text = self.small_font.render("SPACE: Jump | C: Duck", True, BLACK)
-            self.screen.blit(controls_text, (SCREEN_WIDTH - 200, 10))
+            controls_text = text.render(self.small_font, "SPACE: Jump | C: Duck", BLACK)
+            rects.append(self.screen.blit(controls_text, (SCREEN_WIDTH - 200, 10)))
             
         elif self.state == GAME_OVER:
-            # Draw game over screen
-            self.ground.draw(self.screen)
-            self.dinosaur.draw(self.screen)
-            
-            for obstacle in self.obstacles:
-                obstacle.draw(self.screen)
-            
             # Game over overlay
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            overlay.set_alpha(128)
-            overlay.fill(BLACK)
-            self.screen.blit(overlay, (0, 0))
+            rects.append(self.screen.blit(self.overlay, (0, 0)))
             
             # Game over text
-            game_over_text = self.font.render("GAME OVER", True, WHITE)
+            game_over_text = text.render(self.font, "GAME OVER", WHITE)
             text_rect = game_over_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 60))
             self.screen.blit(game_over_text, text_rect)
             
-            score_text = self.font.render(f"Final Score: {self.score}", True, WHITE)
-            text_rect = score_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 20))
-            self.screen.blit(score_text, text_rect)
+            text.draw(self.screen, self.font, "Final Score: ", str(self.score), WHITE,
+                      center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 20))
             
             if self.score == self.high_score and self.score > 0:
-                new_record_text = self.small_font.render("NEW HIGH SCORE!", True, ORANGE)
+                new_record_text = text.render(self.small_font, "NEW HIGH SCORE!", ORANGE)
                 text_rect = new_record_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 10))
                 self.screen.blit(new_record_text, text_rect)
             
-            restart_text = self.font.render("Press SPACE to restart", True, WHITE)
+            restart_text = text.render(self.font, "Press SPACE to restart", WHITE)
             text_rect = restart_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 40))
             self.screen.blit(restart_text, text_rect)
         
-        pygame.display.flip()
+        if self.show_profiler:
+            rects.append(prof.draw_overlay(self.screen, text, self.small_font))
+        if prof:
+            prof.lap('draw.hud', t)
+        
+        return rects
     
-    def restart_game(self):
+    def snapshot(self):
+        # The full simulation state: every number in one flat array, plus
+        # the generator state (an immutable tuple) and the seed. Restoring
+        # it into this game rewinds it; restoring it into another game,
+        # such as a headless copy, lets that game explore what happens
+        # next. The sky and ground are visual and are not included.
+        dino = self.dinosaur
+        values = array('d', (
+            self.frame, self.score, self.high_score, self.state,
+            -1 if self.death_cause is None else OBSTACLE_TYPES.index(self.death_cause),
+            self.obstacle_spawn_timer, len(self.input_log),
+            dino.y, dino.prev_y, dino.velocity_y, dino.is_jumping, dino.is_ducking,
+            dino.animation_frame, len(self.obstacles),
+        ))
+        for obstacle in self.obstacles:
+            obstacle.save_state(values)
+        # The generator is only drawn from on spawns, so its state is
+        # usually unchanged since the last snapshot
+        if self.rng_state is None:
+            self.rng_state = self.rng.getstate()
+        return Snapshot(values, self.rng_state, self.seed)
+    
+    def restore(self, snapshot):
+        values = snapshot.values
+        frame, score, high_score, state, cause, spawn_timer, inputs = values[:7]
+        self.frame = int(frame)
+        self.score = int(score)
+        self.high_score = int(high_score)
+        self.state = int(state)
+        self.obstacle_spawn_timer = int(spawn_timer)
+        self.current_speed = self.schedule.speed(self.frame)
+        self.obstacle_spawn_delay = self.schedule.spawn_delay(self.frame)
+        self.death_cause = None if cause < 0 else OBSTACLE_TYPES[int(cause)]
+        # Inputs are only ever appended, so rewinding truncates the log
+        del self.input_log[int(inputs):]
+        
+        dino = self.dinosaur
+        (dino.y, dino.prev_y, dino.velocity_y, jumping, ducking, dino.animation_frame,
+         count) = values[7:14]
+        dino.is_jumping = bool(jumping)
+        dino.is_ducking = bool(ducking)
+        self.obstacles.load_state(values, 14, int(count))
+        
+        if self.rng_state is not snapshot.rng_state:
+            self.rng.setstate(snapshot.rng_state)
+            self.rng_state = snapshot.rng_state
+        self.seed = snapshot.seed
+    
+    def seek(self, frame):
+        # Restart the current seed's run and jump straight to `frame`, as if
+        # it had been played to there without input and without dying. The
+        # schedule gives the speed, sky and distance for the frame directly;
+        # only the obstacle spawns before it are drawn, which is what keeps
+        # the generator in step with a simulated run.
+        self.restart_game(self.seed)
+        schedule = self.schedule
+        distance = schedule.distance(frame)
+        store = self.obstacles
+        last_spawn = 0
+        spawn_frames = {}
+        for spawn_frame in schedule.spawn_frames():
+            if spawn_frame > frame:
+                break
+            # Obstacles spawn at the right edge and move in the same update
+            obstacle = self.spawn_obstacle()
+            obstacle.x = SCREEN_WIDTH - (distance - schedule.distance(spawn_frame - 1))
+            spawn_frames[obstacle] = spawn_frame
+            store.cull()
+            last_spawn = spawn_frame
+        
+        self.frame = frame
+        self.score = frame
+        self.current_speed = schedule.speed(frame)
+        self.obstacle_spawn_delay = schedule.spawn_delay(frame)
+        self.obstacle_spawn_timer = frame - last_spawn
+        for obstacle in store:
+            obstacle.prev_x = obstacle.x + self.current_speed
+            obstacle.rect.x = int(obstacle.x)
+            if obstacle.type == 'bird':
+                # Summed like update does, so the wing pose matches exactly
+                for _ in range(spawn_frames[obstacle], frame + 1):
+                    obstacle.wing_animation += 0.3
+        self.dinosaur.animation_frame = self.dinosaur.run_animation_speed * frame
+        if self.ground is not None:
+            self.sky_color = schedule.sky_color(frame)
+            self.ground.speed = self.current_speed
+    
+    def record_run(self):
+        # Queue the run that just ended, by dying or by being abandoned
+        if self.scores is not None and self.frame:
+            self.scores.record(self)
+            # The store also knows runs from earlier sessions
+            self.high_score = max(self.high_score, self.scores.high_score)
+    
+    def restart_game(self, seed=None):
+        if self.state == RUNNING:
+            self.record_run()  # abandoned
+        
+        # Every run gets its own seed; without one, the next seed is drawn
+        # from the current generator so a sequence of runs stays reproducible
+        self.seed = seed if seed is not None else self.rng.getrandbits(32)
+        self.rng.seed(self.seed)
+        self.rng_state = None
+        if self.ground is not None:
+            self.ground.rng.seed(self.seed)
+        self.frame = 0
+        self.input_log = []
         self.dinosaur = Dinosaur(100, SCREEN_HEIGHT - GROUND_HEIGHT - 60)
-        self.obstacles = []
+        self.obstacles.clear()
         self.score = 0
         self.obstacle_spawn_timer = 0
-        self.obstacle_spawn_delay = 90
-        self.current_speed = self.base_speed
-        self.speed_increase_timer = 0
-        self.day_night_cycle = 0
+        self.obstacle_spawn_delay = self.schedule.spawn_delay(0)
+        self.current_speed = self.schedule.speed(0)
         self.sky_color = BLUE
         self.state = RUNNING
+        self.death_cause = None
     
-    def run(self):
+    def run(self, controller=None):
+        # Fixed-timestep loop: real time accumulates and is consumed in
+        # whole simulation ticks, so gameplay speed does not depend on the
+        # render rate. Rendering interpolates between the last two ticks.
+        # The optional controller is called before every tick, as in simulate.
+        tick = 1.0 / SIM_RATE
+        accumulator = 0.0
+        last_time = time.perf_counter()
+        first_frame = True
         running = True
         while running:
+            now = time.perf_counter()
+            accumulator += now - last_time
+            last_time = now
+            
+            prof = self.profiler
+            if prof:
+                t = now
+            
             running = self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(FPS)
+            if prof:
+                t = prof.lap('events', t)
+            
+            ticks = 0
+            while accumulator >= tick and ticks < MAX_CATCH_UP_TICKS:
+                if controller is not None and self.state == RUNNING:
+                    controller(self)
+                self.update()
+                accumulator -= tick
+                ticks += 1
+            if accumulator >= tick:
+                # Too far behind to catch up; drop the backlog
+                accumulator %= tick
+            if prof:
+                prof.lap('update', t)
+            
+            alpha = accumulator / tick if self.state == RUNNING else 1.0
+            self.draw(alpha)
+            if self.governor is not None:
+                # Work done this frame, not counting the wait for the next one
+                self.governor.record(time.perf_counter() - now)
+            if first_frame:
+                # Start audio once the first frame is on screen
+                self.init_audio()
+                first_frame = False
+            
+            if prof:
+                t = time.perf_counter()
+            if self.render_fps:
+                self.clock.tick(self.render_fps)
+            else:
+                self.clock.tick()
+            if prof:
+                prof.lap('tick', t)
+                prof.end_frame()
         
+        if self.capture is not None:
+            self.capture.close()
+        if self.scores is not None:
+            if self.state == RUNNING:
+                self.record_run()  # abandoned
+            self.scores.close()
         pygame.quit()
         sys.exit()
 
+def window_size(text):
+    try:
+        width, height = (int(n) for n in text.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {text!r}")
+    return width, height
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dinosaur runner game")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--fps', type=int, default=FPS, help="render rate, 0 for uncapped")
+    parser.add_argument('--dirty-rects', action='store_true', help="only redraw changed regions")
+    parser.add_argument('--collision', choices=COLLISION_MODES, default='discrete',
+                        help="collision test (default discrete)")
+    parser.add_argument('--quality', choices=TIER_NAMES + ('auto',), default='high',
+                        help="visual detail, or auto to adapt it to the frame budget")
+    parser.add_argument('--scaling', choices=SCALING_MODES, default='none',
+                        help="how to fit the game to the window (default none, a fixed-size window)")
+    parser.add_argument('--fullscreen', action='store_true')
+    parser.add_argument('--window', metavar='WxH', type=window_size,
+                        help="window size for software scaling (default the game's size)")
+    parser.add_argument('--capture', metavar='PATH',
+                        help="record every frame to a raw RGB stream (or a PNG directory, see --capture-format)")
+    parser.add_argument('--capture-format', choices=('raw', 'png'), default='raw')
+    parser.add_argument('--spectate', metavar='ADDRESS', nargs='?', const='127.0.0.1:8765',
+                        help="stream the game to spectators on host:port or unix:<path> "
+                             "(default 127.0.0.1:8765); watch with spectator.py")
+    parser.add_argument('--scores', metavar='PATH', default=None,
+                        help="score database (default scores.db next to the game)")
+    parser.add_argument('--no-scores', action='store_true', help="do not save scores")
+    parser.add_argument('--profile', action='store_true', help="record frame timings (F3 shows the graph)")
+    parser.add_argument('--metrics', metavar='PATH',
+                        help="export frame-time histograms to a file, or unix:<path> for a socket")
+    args = parser.parse_args(argv)
+    
+    game = Game(seed=args.seed, dirty_rects=args.dirty_rects, render_fps=args.fps,
+                profile=args.profile or args.metrics is not None, collision=args.collision,
+                quality=args.quality, scaling=args.scaling, fullscreen=args.fullscreen,
+                window_size=args.window)
+    if not args.no_scores:
+        from persistence import DEFAULT_PATH, ScoreStore  # deferred: persistence imports this module
+        game.scores = ScoreStore(args.scores or DEFAULT_PATH)
+        game.high_score = game.scores.high_score
+    if args.capture:
+        from capture import FrameCapture  # deferred: pulls in numpy
+        game.capture = FrameCapture(args.capture, (SCREEN_WIDTH, SCREEN_HEIGHT), args.capture_format)
+    if args.spectate:
+        from spectator import SpectatorServer  # deferred: spectator imports this module
+        game.spectators = SpectatorServer(args.spectate).start()
+    if args.metrics:
+        MetricsExporter(game.profiler, args.metrics).start()
+    game.run()
+
 if __name__ == "__main__":
-    game = Game()
-    game.run()
\ No newline at end of file
+    main()
\ No newline at end of file
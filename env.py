@@ -0,0 +1,167 @@
+"""
+Agent environment for the dinosaur game
+
+DinoEnv wraps one Game behind reset/step with a discrete action space and
+either of two observations:
+
+- 'features': dino height, vertical velocity and duck state, the relative
+  position, size and type of the next K obstacles, and the world speed.
+- 'pixels': the scene rendered offscreen without the HUD, downsampled and
+  converted to grayscale straight from a surfarray view of the render
+  surface, with the last few frames stacked.
+
+Observations are written into preallocated buffers and returned as views of
+them, so a step allocates no observation arrays. The view returned by one
+step is overwritten by the next; copy it to keep it.
+"""
+
+import random
+from collections import namedtuple
+
+import numpy as np
+import pygame
+
+from autopilot import hold
+from dinosaur_game import (Game, Ground, RUNNING, SCREEN_WIDTH, SCREEN_HEIGHT, OBSTACLE_TYPES,
+                           COLLISION_MODES)
+
+# Actions, as in batch_env
+NOOP = 0  # run (releases duck)
+JUMP = 1
+DUCK = 2
+
+Discrete = namedtuple('Discrete', 'n')
+Box = namedtuple('Box', 'low high shape dtype')
+
+OBSTACLE_FEATURES = 5  # relative x, relative y, width, height, type
+
+# Grayscale weights (ITU-R BT.601) in 1/256ths
+GRAY_WEIGHTS = (77, 150, 29)
+
+
+class DinoEnv:
+    def __init__(self, observation='features', num_obstacles=3, downsample=4, frame_stack=4,
+                 frame_skip=1, collision='discrete', seed=None):
+        if observation not in ('features', 'pixels'):
+            raise ValueError(f"Unknown observation type {observation!r}")
+        if collision not in COLLISION_MODES:
+            raise ValueError(f"Unknown collision mode {collision!r}")
+        self.observation = observation
+        self.num_obstacles = num_obstacles
+        self.frame_skip = frame_skip  # frames each action is held for
+        self.game = Game(headless=True, seed=seed, collision=collision)
+        self.action_space = Discrete(3)
+
+        if observation == 'features':
+            size = 3 + OBSTACLE_FEATURES * num_obstacles + 1
+            self.features = np.zeros(size, dtype=np.float32)
+            self.observation_space = Box(-np.inf, np.inf, (size,), np.float32)
+            return
+
+        # Render offscreen: a headless game with a ground updates and draws
+        # the scene like a windowed one, onto a plain surface
+        game = self.game
+        game.screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), 0, 32)
+        game.ground = Ground(random.Random(game.seed))
+        self.downsample = downsample
+        self.frame_stack = frame_stack
+        height = -(-SCREEN_HEIGHT // downsample)
+        width = -(-SCREEN_WIDTH // downsample)
+
+        # Every frame is written twice, frame_stack apart, so the last
+        # frame_stack frames are always one contiguous slice in order
+        self.frames = np.zeros((2 * frame_stack, height, width), dtype=np.uint8)
+        self.index = 0
+        self.gray = np.zeros((width, height), dtype=np.uint16)  # x-major, like surfarray
+        self.channel = np.zeros((width, height), dtype=np.uint16)
+        self.observation_space = Box(0, 255, (frame_stack, height, width), np.uint8)
+
+    def reset(self, seed=None):
+        game = self.game
+        game.restart_game(seed)
+        if self.observation == 'features':
+            return self.observe_features()
+
+        self.render_frame()
+        # Start with the first frame repeated through the whole stack
+        self.frames[:] = self.frames[self.index]
+        self.index = 0
+        return self.frames[1:1 + self.frame_stack]
+
+    def step(self, action):
+        """Hold `action` for frame_skip frames; returns (observation, reward, done, info)
+
+        The reward is 1 for every frame survived.
+        """
+        game = self.game
+        hold(game, action)
+        reward = 0.0
+        for _ in range(self.frame_skip):
+            game.update()
+            if game.state != RUNNING:
+                break
+            reward += 1.0
+        done = game.state != RUNNING
+        info = {'score': game.score, 'frame': game.frame}
+
+        if self.observation == 'features':
+            return self.observe_features(), reward, done, info
+
+        self.render_frame()
+        start = self.index + 1
+        return self.frames[start:start + self.frame_stack], reward, done, info
+
+    def observe_features(self):
+        game = self.game
+        dino = game.dinosaur
+        features = self.features
+        features[0] = (dino.ground_y - dino.y) / SCREEN_HEIGHT
+        features[1] = dino.velocity_y / -dino.jump_strength
+        features[2] = dino.is_ducking
+
+        # The next obstacles ahead of the dinosaur, nearest first; missing
+        # ones are placed a screen width away
+        i = 3
+        end = 3 + OBSTACLE_FEATURES * self.num_obstacles
+        for obstacle in game.obstacles:
+            if i == end:
+                break
+            if obstacle.x + obstacle.width <= dino.x:
+                continue  # already passed
+            features[i] = (obstacle.x - dino.x - dino.width) / SCREEN_WIDTH
+            features[i + 1] = (dino.ground_y + dino.height - obstacle.y - obstacle.height) / SCREEN_HEIGHT
+            features[i + 2] = obstacle.width / SCREEN_WIDTH
+            features[i + 3] = obstacle.height / SCREEN_HEIGHT
+            features[i + 4] = OBSTACLE_TYPES.index(obstacle.type)
+            i += OBSTACLE_FEATURES
+        features[i:end] = 0.0
+        features[i:end:OBSTACLE_FEATURES] = 1.0
+
+        features[-1] = game.current_speed / game.base_speed
+        return features
+
+    def render_frame(self):
+        # Draw the scene and write a downsampled grayscale copy of it into
+        # the frame ring, reading the surface's pixels in place
+        game = self.game
+        game.screen.fill(game.sky_color)
+        game.draw_scene(hud=False)
+
+        step = self.downsample
+        gray = self.gray
+        channel = self.channel
+        pixels = pygame.surfarray.pixels3d(game.screen)  # view, locks the surface
+        np.multiply(pixels[::step, ::step, 0], GRAY_WEIGHTS[0], out=gray, dtype=np.uint16)
+        for c in (1, 2):
+            np.multiply(pixels[::step, ::step, c], GRAY_WEIGHTS[c], out=channel, dtype=np.uint16)
+            gray += channel
+        del pixels  # unlock before the next draw
+
+        self.index = (self.index + 1) % self.frame_stack
+        frames = self.frames
+        np.right_shift(gray, 8, out=frames[self.index].T, casting='unsafe')
+        frames[self.index + self.frame_stack] = frames[self.index]
+
+    def close(self):
+        self.game.screen = None
+        self.game.ground = None
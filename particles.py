@@ -0,0 +1,77 @@
+"""
+Array-backed particle pool
+
+Particles live in fixed-capacity NumPy arrays (x, y, life). Aging and culling
+are whole-array operations, dead particles are replaced by live ones from the
+end of the pool (swap-compaction), and drawing blits one pre-rendered stamp
+per particle in a single batched call.
+"""
+
+import numpy as np
+import pygame
+
+
+class ParticlePool:
+    def __init__(self, capacity, max_life, radius, color_for_life):
+        self.capacity = capacity
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.life = np.zeros(capacity, dtype=np.int32)
+        self.count = 0
+
+        # One stamp per possible life value, so colours are computed once
+        self.radius = radius
+        self.stamps = []
+        for life in range(max_life + 1):
+            stamp = pygame.Surface((2 * radius + 1, 2 * radius + 1), pygame.SRCALPHA)
+            pygame.draw.circle(stamp, color_for_life(life), (radius, radius), radius)
+            self.stamps.append(stamp)
+
+    def emit(self, x, y, life):
+        # New particles are dropped when the pool is full
+        if self.count < self.capacity:
+            i = self.count
+            self.x[i] = x
+            self.y[i] = y
+            self.life[i] = life
+            self.count += 1
+
+    def update(self, dx):
+        # Move and age all particles; those that expire or leave the
+        # screen are culled
+        n = self.count
+        if not n:
+            return
+        x = self.x[:n]
+        life = self.life[:n]
+        x -= dx
+        life -= 1
+        alive = (life > 0) & (x >= 0)
+
+        # Swap-compaction: fill holes in the first `kept` slots with the
+        # survivors beyond them, moving as few particles as possible
+        kept = int(np.count_nonzero(alive))
+        holes = np.flatnonzero(~alive[:kept])
+        if holes.size:
+            movers = np.flatnonzero(alive[kept:]) + kept
+            for values in (self.x, self.y, self.life):
+                values[holes] = values[movers]
+        self.count = kept
+
+    def draw(self, screen):
+        # Returns the bounding rect of all particles, or None
+        n = self.count
+        if not n:
+            return None
+        stamps = self.stamps
+        left = self.x[:n].astype(np.int32) - self.radius
+        top = self.y[:n].astype(np.int32) - self.radius
+        lives = self.life[:n].tolist()
+        screen.blits([(stamps[life], (x, y)) for life, x, y in zip(lives, left.tolist(), top.tolist())], False)
+
+        size = 2 * self.radius + 1
+        x, y = int(left.min()), int(top.min())
+        return pygame.Rect(x, y, int(left.max()) + size - x, int(top.max()) + size - y)
+
+    def clear(self):
+        self.count = 0
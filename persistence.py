@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Durable scores and run statistics for the dinosaur game
+
+ScoreStore keeps a record of every run in SQLite: score, length, peak
+speed, what ended it and how many inputs it took. The game only puts the
+finished run on a queue. A background thread writes queued runs in
+batches, one transaction each, to a database in WAL mode. After each batch
+it rewrites a small JSON summary, and the next start reads the high score
+from that summary without opening the database. The frame loop never
+touches the disk.
+
+Leaderboards and per-day aggregates are indexed queries on the database,
+and can be run while a game is writing to it:
+
+    python persistence.py leaderboard [--day YYYY-MM-DD]
+    python persistence.py daily [--days 7]
+"""
+
+import argparse
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from collections import namedtuple
+
+from dinosaur_game import DUCK, JUMP, SIM_RATE
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scores.db')
+
+RunRecord = namedtuple('RunRecord', 'finished seed score frames duration peak_speed death_cause '
+                                    'jumps ducks collision')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    finished REAL NOT NULL,     -- unix time the run ended
+    day TEXT NOT NULL,          -- local date it ended, YYYY-MM-DD
+    seed INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    frames INTEGER NOT NULL,
+    duration REAL NOT NULL,     -- seconds of game time
+    peak_speed REAL NOT NULL,
+    death_cause TEXT,           -- NULL if the run was abandoned
+    jumps INTEGER NOT NULL,
+    ducks INTEGER NOT NULL,
+    collision TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_score ON runs (score DESC);
+CREATE INDEX IF NOT EXISTS runs_day_score ON runs (day, score DESC);
+"""
+
+
+def summary_path(path):
+    return os.path.splitext(path)[0] + '.json'
+
+
+def run_record(game):
+    """The run a game has just finished"""
+    jumps = ducks = 0
+    for _, action in game.input_log:
+        if action == JUMP:
+            jumps += 1
+        elif action == DUCK:
+            ducks += 1
+    # Speed only ever rises during a run, so the last speed is the peak
+    return RunRecord(time.time(), game.seed, game.score, game.frame, game.frame / SIM_RATE,
+                     game.current_speed, game.death_cause, jumps, ducks, game.collision)
+
+
+def connect(path):
+    connection = sqlite3.connect(path)
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute('PRAGMA synchronous=NORMAL')  # durable at checkpoints; fine for scores
+    connection.executescript(SCHEMA)
+    return connection
+
+
+class ScoreStore:
+    def __init__(self, path=DEFAULT_PATH, batch_size=256, flush_interval=2.0):
+        self.path = path
+        self.batch_size = batch_size  # most runs written per transaction
+        self.flush_interval = flush_interval  # seconds a queued run may wait for company
+        self.summary_path = summary_path(path)
+        self.queue = queue.SimpleQueue()
+
+        # The summary is a few dozen bytes, so reading it is all startup costs
+        self.high_score = 0
+        self.runs = 0
+        self.summary_loaded = False
+        try:
+            with open(self.summary_path) as f:
+                summary = json.load(f)
+            self.high_score = summary['high_score']
+            self.runs = summary['runs']
+            self.summary_loaded = True
+        except (OSError, ValueError, KeyError):
+            pass  # the writer rebuilds it from the database
+
+        self._lock = threading.Lock()  # guards high_score and runs
+        self.written = 0
+        self.error = None  # last error from the writer, which keeps going
+        self._thread = threading.Thread(target=self._run, name='score-writer', daemon=True)
+        self._thread.start()
+
+    def record(self, game):
+        """Queue the run a game has just finished"""
+        record = run_record(game)
+        with self._lock:
+            self.runs += 1
+            self.high_score = max(self.high_score, record.score)
+        self.queue.put(record)
+
+    def close(self):
+        """Write every queued run and stop the writer"""
+        self.queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        try:
+            connection = connect(self.path)
+        except sqlite3.Error as error:
+            self.error = error  # runs stay queued in memory for the rest of the session
+            return
+        if not self.summary_loaded:
+            high_score, runs = connection.execute(
+                'SELECT COALESCE(MAX(score), 0), COUNT(*) FROM runs').fetchone()
+            # Runs recorded before this finished count too
+            with self._lock:
+                self.high_score = max(self.high_score, high_score)
+                self.runs += runs
+            self._write_summary()
+
+        stopping = False
+        while not stopping:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while batch[-1] is not None and len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            if batch[-1] is None:
+                stopping = True
+                batch.pop()
+            if batch:
+                self._write(connection, batch)
+        connection.close()
+
+    def _write(self, connection, batch):
+        rows = [(r.finished, time.strftime('%Y-%m-%d', time.localtime(r.finished)), r.seed, r.score,
+                 r.frames, r.duration, r.peak_speed, r.death_cause, r.jumps, r.ducks, r.collision)
+                for r in batch]
+        try:
+            with connection:
+                connection.executemany(
+                    'INSERT INTO runs (finished, day, seed, score, frames, duration, peak_speed, '
+                    'death_cause, jumps, ducks, collision) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    rows)
+            self.written += len(rows)
+        except sqlite3.Error as error:
+            self.error = error  # scores are not worth stopping the game for
+            return
+        self._write_summary()
+
+    def _write_summary(self):
+        # Written whole and renamed into place, so a reader never sees half of it
+        with self._lock:
+            summary = {'high_score': self.high_score, 'runs': self.runs, 'updated': time.time()}
+        temporary = self.summary_path + '.tmp'
+        try:
+            with open(temporary, 'w') as f:
+                json.dump(summary, f)
+            os.replace(temporary, self.summary_path)
+        except OSError as error:
+            self.error = error
+
+
+def leaderboard(connection, limit=10, day=None):
+    """Best runs, overall or on one day, as (score, day, duration, death cause) rows"""
+    if day is None:
+        return connection.execute(
+            'SELECT score, day, duration, death_cause FROM runs ORDER BY score DESC LIMIT ?',
+            (limit,)).fetchall()
+    return connection.execute(
+        'SELECT score, day, duration, death_cause FROM runs WHERE day = ? ORDER BY score DESC LIMIT ?',
+        (day, limit)).fetchall()
+
+
+def daily(connection, days=7):
+    """Per-day aggregates for the last `days` days with runs, newest first: (day, runs, best,
+    mean score, hours played, cactus deaths, bird deaths, inputs)"""
+    return connection.execute(
+        'SELECT day, COUNT(*), MAX(score), AVG(score), SUM(duration) / 3600, '
+        "SUM(death_cause = 'cactus'), SUM(death_cause = 'bird'), SUM(jumps + ducks) "
+        'FROM runs WHERE day >= '
+        "COALESCE((SELECT DISTINCT day FROM runs ORDER BY day DESC LIMIT 1 OFFSET ?), '') "
+        'GROUP BY day ORDER BY day DESC',
+        (days - 1,)).fetchall()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dinosaur game scores and run statistics")
+    parser.add_argument('--scores', default=DEFAULT_PATH, help="score database")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    best = commands.add_parser('leaderboard', help="best runs")
+    best.add_argument('--day', help="only runs on this day (YYYY-MM-DD)")
+    best.add_argument('--limit', type=int, default=10)
+
+    days = commands.add_parser('daily', help="per-day aggregates")
+    days.add_argument('--days', type=int, default=7)
+
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.scores):
+        print(f"no scores at {args.scores}", file=sys.stderr)
+        return 1
+    connection = sqlite3.connect(args.scores)
+
+    if args.command == 'leaderboard':
+        for rank, (score, day, duration, cause) in enumerate(
+                leaderboard(connection, args.limit, args.day), 1):
+            print(f"{rank:>3}. {score:>7}  {day}  {duration:7.1f}s  {cause or 'abandoned'}")
+        return 0
+
+    print(f"{'day':<10} {'runs':>6} {'best':>7} {'mean':>7} {'hours':>6} {'cactus':>7} {'bird':>6} "
+          f"{'inputs':>7}")
+    for day, runs, best_score, mean, hours, cactus, bird, inputs in daily(connection, args.days):
+        print(f"{day:<10} {runs:>6} {best_score:>7} {mean:>7.0f} {hours:>6.2f} {cactus:>7} {bird:>6} "
+              f"{inputs:>7}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Presenting the game on displays of any size
+
+The game always draws at its logical resolution onto a canvas surface, so
+drawing costs the same on any panel. A Presenter owns the window and puts
+the canvas on it once per frame:
+
+- 'none': the canvas is the window itself, at the logical size.
+- 'gpu' / 'gpu-smooth': the canvas is a pygame.SCALED window. SDL scales it
+  to the window or screen on the GPU, letterboxed, with nearest-neighbour or
+  linear filtering.
+- 'integer' / 'smooth': software fallbacks for when there is no accelerated
+  renderer. The canvas is an offscreen surface scaled into the middle of the
+  window, by the largest whole factor that fits or by a filtered fit, with
+  black bars around it.
+"""
+
+import os
+
+import pygame
+
+SCALING_MODES = ('none', 'gpu', 'gpu-smooth', 'integer', 'smooth')
+
+
+class Presenter:
+    def __init__(self, size, scaling='none', fullscreen=False, window_size=None):
+        if scaling not in SCALING_MODES:
+            raise ValueError(f"Unknown scaling mode {scaling!r}")
+        self.size = size
+        self.scaling = scaling
+        flags = pygame.FULLSCREEN if fullscreen else 0
+
+        if scaling in ('none', 'gpu', 'gpu-smooth'):
+            if scaling != 'none':
+                # SDL reads the filter when it creates the renderer
+                os.environ['SDL_RENDER_SCALE_QUALITY'] = 'linear' if scaling == 'gpu-smooth' else 'nearest'
+                flags |= pygame.SCALED
+            self.window = pygame.display.set_mode(size, flags)
+            self.canvas = self.window
+            return
+
+        if fullscreen:
+            window_size = (0, 0)  # the desktop resolution
+        else:
+            flags |= pygame.RESIZABLE
+        self.window = pygame.display.set_mode(window_size or size, flags)
+        self.canvas = pygame.Surface(size).convert(self.window)
+        self.layout()
+
+    def layout(self):
+        """Fit the canvas to the window's current size, centred between black bars"""
+        if self.canvas is self.window:
+            return  # SDL does the fitting
+        self.window = pygame.display.get_surface()
+        window_width, window_height = self.window.get_size()
+        width, height = self.size
+        self.factor = min(window_width // width, window_height // height)
+        if self.scaling == 'integer' and self.factor >= 1:
+            target_size = (width * self.factor, height * self.factor)
+        else:
+            # Filtered fit; also used when the window is smaller than the canvas
+            self.factor = 0
+            scale = min(window_width / width, window_height / height)
+            target_size = (max(1, int(width * scale)), max(1, int(height * scale)))
+
+        self.target = pygame.Rect((0, 0), target_size)
+        self.target.center = (window_width // 2, window_height // 2)
+        self.view = self.window.subsurface(self.target)
+        self.window.fill((0, 0, 0))
+        self.stale = True  # the bars are not on screen yet
+
+    def present(self, rects=None):
+        """Show the canvas; `rects` limits the update to the canvas regions that changed"""
+        if self.canvas is self.window:
+            if rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects)
+            return
+
+        factor = self.factor
+        if rects is None or self.stale or not factor:
+            if factor:
+                pygame.transform.scale(self.canvas, self.target.size, self.view)
+            else:
+                pygame.transform.smoothscale(self.canvas, self.target.size, self.view)
+            pygame.display.flip()
+            self.stale = False
+            return
+
+        # Integer scaling maps canvas pixels to whole blocks, so changed
+        # regions can be scaled on their own without seams
+        bounds = self.canvas.get_rect()
+        updated = []
+        for rect in rects:
+            rect = rect.clip(bounds)
+            if not rect:
+                continue
+            dest = pygame.Rect(rect.x * factor, rect.y * factor, rect.w * factor, rect.h * factor)
+            pygame.transform.scale(self.canvas.subsurface(rect), dest.size, self.view.subsurface(dest))
+            updated.append(dest.move(self.target.topleft))
+        pygame.display.update(updated)
@@ -0,0 +1,168 @@
+"""
+Per-frame profiler for the dinosaur game
+
+FrameProfiler records how long each phase of a frame takes into fixed-size
+ring buffers (one slot per frame, per phase), so recording is a subtraction
+and an add. Game only calls into it when profiling is on. It can draw a
+frame-time graph over the game, and MetricsExporter writes rolling
+histograms of the buffers to a file or Unix socket from a background thread.
+"""
+
+import json
+import socket
+import threading
+import time
+from array import array
+
+import pygame
+
+# Phases of a frame in the order they run; dotted phases are sub-timings
+PHASES = (
+    'events',
+    'update', 'update.spawn', 'update.obstacles', 'update.collision',
+    'draw', 'draw.ground', 'draw.dino', 'draw.obstacles', 'draw.hud',
+    'present',
+    'capture',
+    'tick',
+    'frame',
+)
+
+# Histogram bucket upper bounds, in milliseconds
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 16.7, 33.3, 66.7, float('inf'))
+
+FRAME_BUDGET_MS = 1000 / 60
+
+GRAPH_WIDTH = 240
+GRAPH_HEIGHT = 80
+GRAPH_MAX_MS = 2 * FRAME_BUDGET_MS
+
+
+class FrameProfiler:
+    def __init__(self, frames=600):
+        self.frames = frames
+        self.buffers = {phase: array('d', bytes(8 * frames)) for phase in PHASES}
+        self.index = 0  # slot of the frame being recorded
+        self.count = 0  # frames completed
+        self.frame_start = time.perf_counter()
+        self._panel = None
+
+    def lap(self, phase, start):
+        """Add the time since `start` to a phase of the current frame; returns now"""
+        now = time.perf_counter()
+        self.buffers[phase][self.index] += now - start
+        return now
+
+    def end_frame(self):
+        now = time.perf_counter()
+        self.buffers['frame'][self.index] = now - self.frame_start
+        self.frame_start = now
+        self.count += 1
+        self.index = (self.index + 1) % self.frames
+        for buffer in self.buffers.values():
+            buffer[self.index] = 0.0
+
+    def samples(self, phase):
+        """Seconds spent in a phase for each completed frame, oldest first"""
+        buffer = self.buffers[phase]
+        if self.count < self.frames:
+            return buffer[:self.index]
+        return buffer[self.index + 1:] + buffer[:self.index]
+
+    def summary(self):
+        """Per-phase percentiles and histogram over the frames in the buffers"""
+        result = {}
+        for phase in PHASES:
+            samples = sorted(self.samples(phase))
+            if not samples:
+                continue
+            histogram = [0] * len(BUCKETS_MS)
+            bucket = 0
+            for seconds in samples:
+                while seconds * 1000 > BUCKETS_MS[bucket]:
+                    bucket += 1
+                histogram[bucket] += 1
+            result[phase] = {
+                'p50_ms': samples[len(samples) // 2] * 1000,
+                'p95_ms': samples[int(len(samples) * 0.95)] * 1000,
+                'max_ms': samples[-1] * 1000,
+                'histogram': histogram,
+            }
+        return result
+
+    def draw_overlay(self, screen, text, font):
+        """Draw a frame-time graph in the top right corner; returns the rect drawn to"""
+        if self._panel is None:
+            self._panel = pygame.Surface((GRAPH_WIDTH, GRAPH_HEIGHT))
+            self._panel.set_alpha(160)
+            self._panel.fill((0, 0, 0))
+        rect = screen.blit(self._panel, (screen.get_width() - GRAPH_WIDTH - 10, 35))
+
+        # Frame budget line
+        budget_y = rect.bottom - int(FRAME_BUDGET_MS / GRAPH_MAX_MS * GRAPH_HEIGHT)
+        pygame.draw.line(screen, (255, 165, 0), (rect.left, budget_y), (rect.right - 1, budget_y))
+
+        samples = self.samples('frame')[-GRAPH_WIDTH:]
+        if len(samples) > 1:
+            scale = GRAPH_HEIGHT / GRAPH_MAX_MS * 1000
+            points = [(rect.left + i, rect.bottom - 1 - min(GRAPH_HEIGHT - 1, int(seconds * scale)))
+                      for i, seconds in enumerate(samples)]
+            pygame.draw.lines(screen, (0, 255, 0), False, points)
+
+            ordered = sorted(samples)
+            p95 = ordered[int(len(ordered) * 0.95)] * 1000
+            text.draw(screen, font, "frame p95 ms: ", f"{p95:.1f}", (255, 255, 255),
+                      (rect.left + 4, rect.top + 2))
+        return rect
+
+
+class MetricsExporter:
+    """Periodically writes profiler summaries as JSON lines from a background thread
+
+    The target is a file path, appended to, or 'unix:<path>' for a Unix
+    stream socket. Export failures are ignored so a missing listener never
+    affects the game.
+    """
+
+    def __init__(self, profiler, target, interval=5.0):
+        self.profiler = profiler
+        self.target = target
+        self.interval = interval
+        self._socket = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='metrics-exporter', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        if self._socket is not None:
+            self._socket.close()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.export()
+
+    def export(self):
+        record = {
+            'time': time.time(),
+            'frames': self.profiler.count,
+            'buckets_ms': [bound if bound != float('inf') else None for bound in BUCKETS_MS],
+            'phases': self.profiler.summary(),
+        }
+        line = (json.dumps(record) + '\n').encode()
+        try:
+            if self.target.startswith('unix:'):
+                if self._socket is None:
+                    self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                    self._socket.connect(self.target[len('unix:'):])
+                self._socket.sendall(line)
+            else:
+                with open(self.target, 'ab') as f:
+                    f.write(line)
+        except OSError:
+            if self._socket is not None:
+                self._socket.close()
+                self._socket = None
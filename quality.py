@@ -0,0 +1,104 @@
+"""
+Adaptive visual quality for the dinosaur game
+
+Quality tiers trade visual detail for frame time: fewer dust particles,
+obstacles drawn as plain shapes without spikes or wing animation, a flat
+ground without texture or rocks, and a sky colour that changes less often
+(in dirty-rect mode every sky change is a full redraw). None of them touch
+the simulation, so a run plays out identically at every tier.
+
+QualityGovernor watches how long each frame's work takes in Game.run and
+steps down a tier when frames run close to the budget, and back up after
+a sustained stretch of headroom.
+"""
+
+from array import array
+from collections import namedtuple
+
+QualityTier = namedtuple('QualityTier', 'name dust_scale simple_obstacles ground_texture sky_interval')
+
+# From best looking to cheapest
+TIERS = (
+    QualityTier('high', dust_scale=1.0, simple_obstacles=False, ground_texture=True, sky_interval=1),
+    QualityTier('medium', dust_scale=0.5, simple_obstacles=False, ground_texture=True, sky_interval=4),
+    QualityTier('low', dust_scale=0.2, simple_obstacles=True, ground_texture=True, sky_interval=15),
+    QualityTier('minimal', dust_scale=0.0, simple_obstacles=True, ground_texture=False, sky_interval=60),
+)
+TIER_NAMES = tuple(tier.name for tier in TIERS)
+
+
+def apply_tier(game, tier):
+    """Set a game's visual detail to a tier"""
+    game.quality = tier
+    if game.ground is not None:
+        game.ground.dust_rate = game.ground.base_dust_rate * tier.dust_scale
+        game.ground.texture = tier.ground_texture
+    game.drawn_sky_color = None  # redraw everything at the new detail
+
+
+class QualityGovernor:
+    """Steps a game's quality tier to keep frame work within a budget
+
+    The mean work time over the last `window` frames is compared with the
+    budget. Above `downgrade_at` of it the tier drops at once; below
+    `upgrade_at` for `upgrade_after` frames in a row it rises again. The
+    gap between the two thresholds and the wait before upgrading keep it
+    from flapping between tiers, and an upgrade that is undone straight
+    away doubles the wait before the next one.
+    """
+
+    def __init__(self, game, budget=1 / 60, window=30, downgrade_at=0.9, upgrade_at=0.6,
+                 upgrade_after=180):
+        self.game = game
+        self.budget = budget
+        self.downgrade_at = downgrade_at
+        self.upgrade_at = upgrade_at
+        self.upgrade_after = upgrade_after
+        self.upgrade_wait = upgrade_after
+        self.tier = TIER_NAMES.index(game.quality.name)
+        self.samples = array('d', bytes(8 * window))
+        self.index = 0
+        self.count = 0
+        self.total = 0.0
+        self.calm = 0  # consecutive frames with headroom
+        self.since_upgrade = None  # frames since the last upgrade
+
+    def record(self, seconds):
+        """Add one frame's work time; returns the new tier if it changed, else None"""
+        samples = self.samples
+        self.total += seconds - samples[self.index]
+        samples[self.index] = seconds
+        self.index = (self.index + 1) % len(samples)
+        self.count += 1
+        if self.since_upgrade is not None:
+            self.since_upgrade += 1
+        if self.count < len(samples):
+            return None  # not enough frames at this tier yet
+
+        mean = self.total / len(samples)
+        if mean > self.budget * self.downgrade_at:
+            self.calm = 0
+            if self.tier < len(TIERS) - 1:
+                if self.since_upgrade is not None and self.since_upgrade <= self.upgrade_wait:
+                    self.upgrade_wait = min(self.upgrade_wait * 2, 8 * self.upgrade_after)
+                self.since_upgrade = None
+                return self.set_tier(self.tier + 1)
+        elif mean < self.budget * self.upgrade_at:
+            self.calm += 1
+            if self.calm >= self.upgrade_wait and self.tier > 0:
+                self.since_upgrade = 0
+                return self.set_tier(self.tier - 1)
+        else:
+            self.calm = 0
+        return None
+
+    def set_tier(self, index):
+        self.tier = index
+        apply_tier(self.game, TIERS[index])
+        # Judge the new tier on its own frames
+        self.samples = array('d', bytes(8 * len(self.samples)))
+        self.index = 0
+        self.count = 0
+        self.total = 0.0
+        self.calm = 0
+        return TIERS[index]
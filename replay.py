@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Compact binary replays for the dinosaur game
+
+A run is fully determined by its seed and its inputs, so a replay stores only
+those: a small header followed by the input log as LEB128 varints. Each
+varint packs the number of frames since the previous input with the action
+in its low two bits, so idle stretches cost nothing and a multi-minute run
+fits in a few hundred bytes.
+"""
+
+import argparse
+import os
+import struct
+import sys
+import time
+
+import pygame
+
+from dinosaur_game import Game, FPS, RUNNING, GAME_OVER, COLLISION_MODES
+
+MAGIC = b'DRPL'
+VERSION = 2
+HEADER = struct.Struct('<4sBQI')  # magic, version, seed, frames
+# Version 2 adds the collision mode, as an index into COLLISION_MODES;
+# version 1 replays were all played with discrete collision
+HEADER_V2 = struct.Struct('<4sBQIB')
+
+
+class ReplayError(ValueError):
+    pass
+
+
+def _write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, pos):
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ReplayError("Truncated replay")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class Replay:
+    def __init__(self, seed, frames, events, collision='discrete'):
+        self.seed = seed
+        self.frames = frames  # length of the run in updates
+        self.events = events  # (frame, action) pairs in frame order
+        self.collision = collision
+
+    @classmethod
+    def from_game(cls, game):
+        """Capture the current run of a game"""
+        return cls(game.seed, game.frame, list(game.input_log), game.collision)
+
+    def to_bytes(self):
+        out = bytearray(HEADER_V2.pack(MAGIC, VERSION, self.seed, self.frames,
+                                       COLLISION_MODES.index(self.collision)))
+        last_frame = 0
+        for frame, action in self.events:
+            _write_varint(out, (frame - last_frame) << 2 | action)
+            last_frame = frame
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < HEADER.size:
+            raise ReplayError("Truncated replay header")
+        magic, version, seed, frames = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ReplayError("Not a replay file")
+        if version == 1:
+            collision = 'discrete'
+            pos = HEADER.size
+        elif version == 2:
+            if len(data) < HEADER_V2.size:
+                raise ReplayError("Truncated replay header")
+            mode = HEADER_V2.unpack_from(data)[4]
+            if mode >= len(COLLISION_MODES):
+                raise ReplayError(f"Unknown collision mode {mode}")
+            collision = COLLISION_MODES[mode]
+            pos = HEADER_V2.size
+        else:
+            raise ReplayError(f"Unsupported replay version {version}")
+
+        events = []
+        frame = 0
+        while pos < len(data):
+            value, pos = _read_varint(data, pos)
+            frame += value >> 2
+            events.append((frame, value & 0x3))
+        return cls(seed, frames, events, collision)
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+def play(replay, render=False, speed=1.0):
+    """Play a replay back and return the finished game
+
+    Headless playback runs at full CPU speed. Rendered playback runs at
+    `speed` times normal speed, or uncapped when speed is 0.
+    """
+    game = Game(headless=not render, seed=replay.seed, collision=replay.collision)
+    events = iter(replay.events)
+    next_event = next(events, None)
+
+    for frame in range(replay.frames):
+        while next_event is not None and next_event[0] == frame:
+            game.apply_action(next_event[1])
+            next_event = next(events, None)
+        game.update()
+
+        if render:
+            if any(event.type == pygame.QUIT for event in pygame.event.get()):
+                break
+            game.draw()
+            if speed:
+                game.clock.tick(FPS * speed)
+
+        if game.state == GAME_OVER:
+            break
+    return game
+
+
+class RecordingGame(Game):
+    """Interactive game that saves a replay of every run when it ends"""
+
+    def __init__(self, directory, **kwargs):
+        super().__init__(**kwargs)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def update(self):
+        was_running = self.state == RUNNING
+        super().update()
+        if was_running and self.state == GAME_OVER:
+            name = time.strftime('%Y%m%d-%H%M%S') + f'-{self.seed:08x}.rpl'
+            path = os.path.join(self.directory, name)
+            Replay.from_game(self).save(path)
+            print(f"Saved replay {path} (score {self.score})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record and play dinosaur game replays")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record = commands.add_parser('record', help="play interactively, saving a replay per run")
+    record.add_argument('directory')
+    record.add_argument('--seed', type=int, default=None)
+    record.add_argument('--collision', choices=COLLISION_MODES, default='discrete')
+
+    play_cmd = commands.add_parser('play', help="play a replay back")
+    play_cmd.add_argument('path')
+    play_cmd.add_argument('--headless', action='store_true', help="simulate only, at full speed")
+    play_cmd.add_argument('--speed', type=float, default=1.0, help="playback speed, 0 for uncapped")
+
+    info = commands.add_parser('info', help="show replay details")
+    info.add_argument('path')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'record':
+        RecordingGame(args.directory, seed=args.seed, collision=args.collision).run()
+
+    replay = Replay.load(args.path)
+    if args.command == 'info':
+        print(f"seed: {replay.seed}")
+        print(f"collision: {replay.collision}")
+        print(f"frames: {replay.frames} ({replay.frames / FPS:.1f}s at {FPS} FPS)")
+        print(f"inputs: {len(replay.events)}")
+        print(f"size: {os.path.getsize(args.path)} bytes")
+        return
+
+    start = time.perf_counter()
+    game = play(replay, render=not args.headless, speed=args.speed)
+    elapsed = time.perf_counter() - start
+    print(f"score: {game.score} ({game.frame} frames in {elapsed:.3f}s)")
+    if game.screen is not None:
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Process-pool rollout runner for the dinosaur game
+
+Plays many headless episodes in parallel and streams back one small
+EpisodeResult per episode (score, length, cause of death). Each episode gets
+a seed derived from the base seed and its index, so results do not depend on
+how episodes are spread across workers.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from dinosaur_game import Game, GAME_OVER, JUMP, DUCK, RELEASE, COLLISION_MODES
+
+EpisodeResult = namedtuple('EpisodeResult', 'episode seed score length cause')
+
+MAX_FRAMES = 100000
+
+
+def episode_seed(seed, episode):
+    """Deterministic seed for one episode of a rollout"""
+    return (seed << 32) | episode
+
+
+def jump_over_cacti(game):
+    """Simple example policy: jump at cacti, duck under low birds"""
+    dino = game.dinosaur
+    for obstacle in game.obstacles:
+        ahead = obstacle.x - (dino.x + dino.width)
+        if obstacle.type == 'cactus':
+            if 0 <= ahead < 6 * game.current_speed and not dino.is_jumping:
+                game.apply_action(JUMP)
+        elif obstacle.y + obstacle.height > dino.ground_y:
+            if obstacle.x + obstacle.width > dino.x - 10 and ahead < 3 * game.current_speed:
+                if not dino.is_ducking:
+                    game.apply_action(DUCK)
+                return
+    if dino.is_ducking:
+        game.apply_action(RELEASE)
+
+
+def play_episodes(policy, episodes, seed, max_frames, collision='discrete'):
+    """Play a chunk of episodes in one headless game (runs in a worker)"""
+    game = Game(headless=True, collision=collision)
+    results = []
+    for episode in episodes:
+        ep_seed = episode_seed(seed, episode)
+        game.restart_game(ep_seed)
+        length = game.simulate(max_frames, policy)
+        cause = game.death_cause if game.state == GAME_OVER else None
+        results.append(EpisodeResult(episode, ep_seed, game.score, length, cause))
+    return results
+
+
+def run_rollouts(policy, episodes, workers=None, seed=0, max_frames=MAX_FRAMES, chunk_size=None,
+                 collision='discrete'):
+    """Play `episodes` games across a process pool, yielding results as they finish
+
+    The policy is called with the game before every frame, like the
+    controller of Game.simulate, and must be picklable (a module-level
+    function). Results arrive in completion order, not episode order.
+    """
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        # A few chunks per worker keeps the pool busy without much IPC
+        chunk_size = max(1, episodes // (workers * 4))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(play_episodes, policy, range(start, min(start + chunk_size, episodes)),
+                        seed, max_frames, collision)
+            for start in range(0, episodes, chunk_size)
+        ]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def summarize(results):
+    """Aggregate episode results into summary statistics"""
+    scores = [result.score for result in results]
+    if not scores:
+        return {'episodes': 0}
+    return {
+        'episodes': len(scores),
+        'mean_score': statistics.fmean(scores),
+        'median_score': statistics.median(scores),
+        'max_score': max(scores),
+        'total_frames': sum(result.length for result in results),
+        'causes': dict(Counter(result.cause for result in results)),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play headless dinosaur game episodes in parallel")
+    parser.add_argument('--episodes', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-frames', type=int, default=MAX_FRAMES)
+    parser.add_argument('--collision', choices=COLLISION_MODES, default='discrete')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = list(run_rollouts(jump_over_cacti, args.episodes, args.workers,
+                                args.seed, args.max_frames, collision=args.collision))
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(results)
+    for key, value in summary.items():
+        print(f"{key}: {value}")
+    print(f"elapsed: {elapsed:.2f}s ({summary['total_frames'] / elapsed:.0f} frames/s)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
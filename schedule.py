@@ -0,0 +1,91 @@
+"""
+Difficulty schedule for the dinosaur game
+
+Everything that changes with time alone, with no dependence on the player,
+is a function of the frame number: the world speed, the obstacle spawn
+delay, the sky colour and the distance travelled. Schedule answers each of
+these for any frame in O(1), lists the frames obstacles spawn on, and can
+generate the obstacles of a seeded run as a lazy stream. Game.update reads
+its difficulty from here and Game.seek uses it to jump to a late frame
+without simulating the frames before it.
+"""
+
+import math
+import random
+from collections import namedtuple
+
+# Sky colours at the two ends of the day/night cycle
+DAY_SKY = (135, 206, 235)
+NIGHT_SKY = (25, 25, 112)  # Midnight blue
+
+# Obstacle types are drawn from this, so there are more cacti than birds
+SPAWN_CHOICES = ('cactus', 'bird', 'cactus')
+
+Spawn = namedtuple('Spawn', 'frame type height y spikes')
+
+
+class Schedule:
+    def __init__(self, base_speed=8, speed_step=0.5, step_frames=300, spawn_delay=90,
+                 min_spawn_delay=30, delay_step=2, day_night_rate=0.02):
+        # Every step_frames frames the speed rises by speed_step and the
+        # spawn delay falls by delay_step, down to min_spawn_delay
+        self.base_speed = base_speed
+        self.speed_step = speed_step
+        self.step_frames = step_frames
+        self.base_spawn_delay = spawn_delay
+        self.min_spawn_delay = min_spawn_delay
+        self.delay_step = delay_step
+        self.day_night_rate = day_night_rate  # radians of the cycle per frame
+
+    # Values for a frame are those in effect during the update that brings
+    # the game to that frame
+
+    def speed(self, frame):
+        return self.base_speed + self.speed_step * (frame // self.step_frames)
+
+    def spawn_delay(self, frame):
+        return max(self.min_spawn_delay,
+                   self.base_spawn_delay - self.delay_step * (frame // self.step_frames))
+
+    def frame_at_speed(self, speed):
+        """First frame at which the world moves at least `speed`"""
+        steps = max(0, math.ceil((speed - self.base_speed) / self.speed_step))
+        return steps * self.step_frames
+
+    def sky_color(self, frame):
+        cycle_pos = (math.sin(self.day_night_rate * frame) + 1) / 2
+        return tuple(int(day + (night - day) * cycle_pos) for day, night in zip(DAY_SKY, NIGHT_SKY))
+
+    def distance(self, frame):
+        """Distance the world has scrolled over the first `frame` updates"""
+        # The speed in update t is base + step * (t // step_frames); sum the
+        # steps block by block
+        blocks, rest = divmod(frame, self.step_frames)
+        steps = self.step_frames * blocks * (blocks - 1) // 2 + blocks * (rest + 1)
+        return self.base_speed * frame + self.speed_step * steps
+
+    def spawn_frames(self):
+        """Frames on which obstacles spawn, in order, without end
+
+        An obstacle spawns once the frames since the last spawn reach the
+        spawn delay in effect, which only changes every step_frames frames.
+        """
+        last = 0
+        while True:
+            frame = last + 1
+            while True:
+                next_step = (frame // self.step_frames + 1) * self.step_frames
+                spawn = max(frame, last + self.spawn_delay(frame))
+                if spawn < next_step:
+                    break
+                frame = next_step
+            yield spawn
+            last = spawn
+
+    def spawns(self, seed):
+        """The obstacles a run with `seed` spawns, as a lazy stream of Spawn records"""
+        from dinosaur_game import Obstacle, SCREEN_WIDTH  # deferred: dinosaur_game imports this module
+        rng = random.Random(seed)
+        for frame in self.spawn_frames():
+            obstacle = Obstacle(SCREEN_WIDTH, rng.choice(SPAWN_CHOICES), rng)
+            yield Spawn(frame, obstacle.type, obstacle.height, obstacle.y, obstacle.spikes)
@@ -1,73 +1,89 @@
 # This file contains simple sound generation for the dinosaur game
-# Due to environment limitations, we'll create placeholder sound functions
+# Sounds are synthesised with whole-array numpy operations and the resulting
+# PCM is cached on disk, keyed by the synthesis parameters and mixer format
+
+import hashlib
+import json
+import os
 
 import pygame
 import numpy as np
 
-def generate_jump_sound():
-    """Generate a simple jump sound effect"""
+SAMPLE_RATE = 22050
+CACHE_VERSION = 1
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+
+# Synthesis parameters for each sound: a sine sweep from freq_start to
+# freq_end, optionally fading out over its duration
+SOUNDS = {
+    'jump': {'duration': 0.2, 'freq_start': 200, 'freq_end': 400, 'volume': 0.3, 'fade': True},
+    'hit': {'duration': 0.5, 'freq_start': 100, 'freq_end': 100, 'volume': 0.3, 'fade': True},
+    'point': {'duration': 0.1, 'freq_start': 800, 'freq_end': 800, 'volume': 0.2, 'fade': False},
+}
+
+def synthesize(duration, freq_start, freq_end, volume, fade, channels=2):
+    """Synthesise a sound as 16-bit PCM with one column per channel"""
+    frames = int(duration * SAMPLE_RATE)
+    i = np.arange(frames)
+    progress = i / frames
+
+    freq = freq_start + (freq_end - freq_start) * progress
+    wave = np.sin(2 * np.pi * freq * i / SAMPLE_RATE)
+    if fade:
+        wave *= volume * (1 - progress)  # Fade out
+    else:
+        wave *= volume
+
+    pcm = (wave * 32767).astype(np.int16)
+    if channels == 1:
+        return pcm
+    return np.repeat(pcm[:, None], channels, axis=1)
+
+def cache_path(name, params, mixer_format):
+    """Content-addressed cache file for a sound's PCM"""
+    key = json.dumps({'version': CACHE_VERSION, 'sample_rate': SAMPLE_RATE,
+                      'params': params, 'mixer': mixer_format}, sort_keys=True)
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f'{name}-{digest}.npy')
+
+def load_pcm(name):
+    """PCM for a named sound, memory-mapped from the cache when possible"""
+    params = SOUNDS[name]
+    mixer_format = pygame.mixer.get_init()
+    channels = mixer_format[2] if mixer_format else 2
+    path = cache_path(name, params, mixer_format)
+
+    try:
+        return np.load(path, mmap_mode='r')
+    except (OSError, ValueError):
+        pass
+
+    pcm = synthesize(channels=channels, **params)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.save(f, pcm)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # Caching is best effort
+    return pcm
+
+def load_sound(name):
+    """Load a named sound effect, or None if sound is unavailable"""
     try:
-        duration = 0.2
-        sample_rate = 22050
-        frames = int(duration * sample_rate)
-        
-        # Generate a simple frequency sweep for jump sound
-        freq_start = 200
-        freq_end = 400
-        
-        arr = np.zeros((frames, 2))
-        for i in range(frames):
-            freq = freq_start + (freq_end - freq_start) * (i / frames)
-            wave = np.sin(2 * np.pi * freq * i / sample_rate)
-            wave *= 0.3 * (1 - i / frames)  # Fade out
-            arr[i] = [wave, wave]
-        
-        # Convert to pygame sound
-        sound_array = np.array(arr * 32767, dtype=np.int16)
-        return pygame.sndarray.make_sound(sound_array)
+        return pygame.sndarray.make_sound(load_pcm(name))
     except:
         return None
 
+def generate_jump_sound():
+    """Generate a simple jump sound effect"""
+    return load_sound('jump')
+
 def generate_hit_sound():
     """Generate a simple hit/game over sound effect"""
-    try:
-        duration = 0.5
-        sample_rate = 22050
-        frames = int(duration * sample_rate)
-        
-        # Generate a simple low frequency for hit sound
-        freq = 100
-        
-        arr = np.zeros((frames, 2))
-        for i in range(frames):
-            wave = np.sin(2 * np.pi * freq * i / sample_rate)
-            wave *= 0.3 * (1 - i / frames)  # Fade out
-            arr[i] = [wave, wave]
-        
-        # Convert to pygame sound
-        sound_array = np.array(arr * 32767, dtype=np.int16)
-        return pygame.sndarray.make_sound(sound_array)
-    except:
-        return None
+    return load_sound('hit')
 
 def generate_point_sound():
     """Generate a simple point scoring sound effect"""
-    try:
-        duration = 0.1
-        sample_rate = 22050
-        frames = int(duration * sample_rate)
-        
-        # Generate a simple high frequency beep
-        freq = 800
-        
-        arr = np.zeros((frames, 2))
-        for i in range(frames):
-            wave = np.sin(2 * np.pi * freq * i / sample_rate)
-            wave *= 0.2
-            arr[i] = [wave, wave]
-        
-        # Convert to pygame sound
-        sound_array = np.array(arr * 32767, dtype=np.int16)
-        return pygame.sndarray.make_sound(sound_array)
-    except:
-        return None
\ No newline at end of file
+    return load_sound('point')
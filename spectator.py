@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Spectator stream for the dinosaur game
+
+SpectatorServer publishes the state behind Game.update every tick to any
+number of local spectators over TCP or a Unix socket, so lobby screens and
+dashboards can watch a run without the game host rendering for them:
+
+- The state of a tick is packed into a fixed-size record: frame, score,
+  high score, game state, world speed, the dinosaur's height and pose, and
+  the first MAX_OBSTACLES obstacles.
+- Most ticks are sent as a delta: a bitmap of the bytes that changed since
+  the previous tick followed by those bytes XORed with their old values,
+  usually a few dozen bytes. Every keyframe_interval ticks the whole
+  record is sent as a keyframe.
+- The server runs an asyncio loop on its own thread. The game thread only
+  packs the record and hands it over; if the server thread is behind, the
+  newest record replaces the pending one and the next delta spans both.
+- A spectator whose socket buffer backs up is skipped rather than waited
+  for. It gets nothing more until the next keyframe, and a new spectator
+  also starts at a keyframe.
+
+Run `python spectator.py [ADDRESS]` to watch a game started with
+`python dinosaur_game.py --spectate`. The viewer draws the stream with
+the game's own drawing code.
+"""
+
+import argparse
+import asyncio
+import socket
+import struct
+import sys
+import threading
+
+import numpy as np
+import pygame
+
+from dinosaur_game import (Game, FPS, MAX_CATCH_UP_TICKS, OBSTACLE_TYPES, OBSTACLE_STATE_SIZE, RUNNING,
+                           SIM_RATE)
+
+DEFAULT_ADDRESS = '127.0.0.1:8765'
+
+# One tick of state: the game and dinosaur, then MAX_OBSTACLES obstacle
+# slots in x order, unused ones zero. Obstacles past the last slot are off
+# the right of the screen.
+GAME_RECORD = struct.Struct('<IIIBbfffBBB')  # frame, score, high score, state, death cause,
+                                             # speed, dino y, dino animation, jumping, ducking,
+                                             # obstacle count
+OBSTACLE_RECORD = struct.Struct('<fBBBhf')  # x, type, height, spikes, y, wing animation
+MAX_OBSTACLES = 8
+STATE_SIZE = GAME_RECORD.size + MAX_OBSTACLES * OBSTACLE_RECORD.size
+BITMAP_SIZE = (STATE_SIZE + 7) // 8
+EMPTY_SLOTS = bytes(MAX_OBSTACLES * OBSTACLE_RECORD.size)
+
+# Every message is this header followed by its payload
+MESSAGE = struct.Struct('<BIH')  # kind, game tick, payload length
+KEYFRAME = 0  # payload is the whole state
+DELTA = 1  # payload is a change bitmap and the changed bytes XOR their previous values
+
+
+class StreamError(ValueError):
+    pass
+
+
+def parse_address(address):
+    """'unix:<path>' or 'host:port', as (family, address)"""
+    if address.startswith('unix:'):
+        return socket.AF_UNIX, address[len('unix:'):]
+    host, _, port = address.rpartition(':')
+    return socket.AF_INET, (host or '127.0.0.1', int(port))
+
+
+def pack_state(game, buffer):
+    """Write a game's state into a STATE_SIZE buffer"""
+    dino = game.dinosaur
+    obstacles = game.obstacles
+    count = min(len(obstacles), MAX_OBSTACLES)
+    cause = -1 if game.death_cause is None else OBSTACLE_TYPES.index(game.death_cause)
+    GAME_RECORD.pack_into(buffer, 0, game.frame, game.score, game.high_score, game.state, cause,
+                          game.current_speed, dino.y, dino.animation_frame, dino.is_jumping,
+                          dino.is_ducking, count)
+    offset = GAME_RECORD.size
+    for _, obstacle in zip(range(count), obstacles):
+        OBSTACLE_RECORD.pack_into(buffer, offset, obstacle.x, OBSTACLE_TYPES.index(obstacle.type),
+                                  obstacle.height, obstacle.spikes, obstacle.y,
+                                  obstacle.wing_animation)
+        offset += OBSTACLE_RECORD.size
+    buffer[offset:] = EMPTY_SLOTS[:STATE_SIZE - offset]
+
+
+def apply_state(game, state):
+    """Load a packed state into a game, for drawing"""
+    (frame, score, high_score, game_state, cause, speed, dino_y, animation, jumping, ducking,
+     count) = GAME_RECORD.unpack_from(state)
+    game.frame = frame
+    game.score = score
+    game.high_score = high_score
+    game.state = game_state
+    game.death_cause = None if cause < 0 else OBSTACLE_TYPES[cause]
+    game.current_speed = speed
+    dino = game.dinosaur
+    dino.y = dino.prev_y = dino_y
+    dino.animation_frame = animation
+    dino.is_jumping = bool(jumping)
+    dino.is_ducking = bool(ducking)
+
+    # Through the snapshot layout, so the store reuses its pooled obstacles
+    values = []
+    for i in range(count):
+        x, kind, height, spikes, y, wing = OBSTACLE_RECORD.unpack_from(
+            state, GAME_RECORD.size + i * OBSTACLE_RECORD.size)
+        values.extend((x, x, kind, height, y, spikes, wing))
+    game.obstacles.load_state(values, 0, len(values) // OBSTACLE_STATE_SIZE)
+
+
+def encode_delta(previous, current):
+    changed = np.bitwise_xor(previous, current)
+    mask = changed != 0
+    return np.packbits(mask).tobytes() + changed[mask].tobytes()
+
+
+def decode_delta(previous, payload):
+    mask = np.unpackbits(np.frombuffer(payload, np.uint8, BITMAP_SIZE), count=STATE_SIZE).view(bool)
+    changed = np.frombuffer(payload, np.uint8, offset=BITMAP_SIZE)
+    if len(changed) != np.count_nonzero(mask):
+        raise StreamError("delta does not match its bitmap")
+    state = previous.copy()
+    state[mask] ^= changed
+    return state
+
+
+class SpectatorServer:
+    def __init__(self, address=DEFAULT_ADDRESS, keyframe_interval=SIM_RATE, max_buffer=64 * 1024):
+        self.family, self.address = parse_address(address)
+        self.keyframe_interval = keyframe_interval  # ticks between keyframes
+        self.max_buffer = max_buffer  # bytes queued for a client before it is skipped
+        self.tick = 0
+
+        # Game thread side: the packed record and the latest one waiting
+        # for the server thread
+        self.state = bytearray(STATE_SIZE)
+        self._pending = None
+        self._lock = threading.Lock()
+
+        # Server thread side
+        self.clients = {}  # writer -> whether it has had every message since a keyframe
+        self._handlers = set()
+        self.previous = np.zeros(STATE_SIZE, dtype=np.uint8)  # last record broadcast
+        self.key_tick = None
+        self.messages = 0
+        self.sent_bytes = 0
+        self.skipped = 0  # messages not sent to clients that were behind
+
+        self.loop = None
+        self.error = None
+        self._stopping = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='spectator-server', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        self._ready.wait()
+        if self.error is not None:
+            raise self.error
+        return self
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self._stopping.set)
+        self._thread.join()
+
+    def publish(self, game):
+        """Send a game's state to the spectators; called by Game.update every tick"""
+        self.tick += 1
+        if not self.clients:
+            return
+        pack_state(game, self.state)
+        with self._lock:
+            waiting = self._pending is not None
+            self._pending = (self.tick, bytes(self.state))
+        if not waiting:
+            self.loop.call_soon_threadsafe(self._broadcast)
+
+    def _broadcast(self):
+        with self._lock:
+            tick, data = self._pending
+            self._pending = None
+        current = np.frombuffer(data, dtype=np.uint8)
+        keyframe = self.key_tick is None or tick - self.key_tick >= self.keyframe_interval
+        if keyframe:
+            message = MESSAGE.pack(KEYFRAME, tick, STATE_SIZE) + data
+            self.key_tick = tick
+        else:
+            payload = encode_delta(self.previous, current)
+            message = MESSAGE.pack(DELTA, tick, len(payload)) + payload
+        self.previous = current
+        self.messages += 1
+
+        clients = self.clients
+        for writer, synced in clients.items():
+            if writer.transport.get_write_buffer_size() > self.max_buffer:
+                # Behind: skip it rather than queue more, and resume at a keyframe
+                clients[writer] = False
+                self.skipped += 1
+            elif synced or keyframe:
+                writer.write(message)
+                clients[writer] = True
+                self.sent_bytes += len(message)
+
+    def _run(self):
+        asyncio.run(self._serve())
+
+    async def _serve(self):
+        self.loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        try:
+            if self.family == socket.AF_UNIX:
+                server = await asyncio.start_unix_server(self._handle_client, self.address)
+            else:
+                server = await asyncio.start_server(self._handle_client, *self.address)
+                self.address = server.sockets[0].getsockname()[:2]  # the real port, if 0
+        except OSError as error:
+            self.error = error
+            self._ready.set()
+            return
+        self._ready.set()
+        async with server:
+            await self._stopping.wait()
+        # Hang up on everyone and let the handlers see it
+        for writer in list(self.clients):
+            writer.close()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+
+    async def _handle_client(self, reader, writer):
+        sock = writer.get_extra_info('socket')
+        if sock.family != socket.AF_UNIX:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.clients[writer] = False
+        self._handlers.add(asyncio.current_task())
+        try:
+            # Spectators only listen; wait for them to hang up
+            while await reader.read(1024):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            del self.clients[writer]
+            self._handlers.discard(asyncio.current_task())
+            writer.close()
+
+
+class StreamDecoder:
+    """Rebuilds the state from the bytes of a spectator stream"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.state = None  # latest state, as a uint8 array
+        self.tick = None
+        self.keyframes = 0
+        self.deltas = 0
+
+    def feed(self, data):
+        """Add received bytes; returns the number of ticks they completed"""
+        buffer = self.buffer
+        buffer += data
+        ticks = 0
+        offset = 0
+        while len(buffer) - offset >= MESSAGE.size:
+            kind, tick, length = MESSAGE.unpack_from(buffer, offset)
+            end = offset + MESSAGE.size + length
+            if len(buffer) < end:
+                break
+            payload = bytes(buffer[offset + MESSAGE.size:end])
+            offset = end
+            if kind == KEYFRAME:
+                if length != STATE_SIZE:
+                    raise StreamError("keyframe of the wrong size")
+                self.state = np.frombuffer(payload, dtype=np.uint8).copy()
+                self.keyframes += 1
+            elif kind == DELTA:
+                if self.state is None:
+                    raise StreamError("delta before the first keyframe")
+                self.state = decode_delta(self.state, payload)
+                self.deltas += 1
+            else:
+                raise StreamError(f"unknown message kind {kind}")
+            self.tick = tick
+            ticks += 1
+        del buffer[:offset]
+        return ticks
+
+
+def connect(address=DEFAULT_ADDRESS):
+    family, address = parse_address(address)
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.connect(address)
+    return sock
+
+
+def view(address=DEFAULT_ADDRESS):
+    """Watch a stream in a window until it ends or the window is closed"""
+    # A game that never updates itself: its state comes from the stream,
+    # and it draws it like any other game
+    game = Game(seed=0)
+    pygame.display.set_caption("Dinosaur Game - spectating")
+    sock = connect(address)
+    sock.setblocking(False)
+    decoder = StreamDecoder()
+    last_tick = None
+
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+
+        try:
+            while True:
+                data = sock.recv(65536)
+                if not data:
+                    running = False  # the game has gone
+                    break
+                decoder.feed(data)
+        except BlockingIOError:
+            pass
+        if decoder.tick != last_tick:
+            apply_state(game, decoder.state)
+            if game.state == RUNNING:
+                # Scroll the ground as far as the game did, within reason
+                ticks = 1 if last_tick is None else min(decoder.tick - last_tick, MAX_CATCH_UP_TICKS)
+                for _ in range(ticks):
+                    game.update_visuals()
+            last_tick = decoder.tick
+
+        game.draw()
+        game.clock.tick(FPS)
+
+    sock.close()
+    pygame.quit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Watch a dinosaur game's spectator stream")
+    parser.add_argument('address', nargs='?', default=DEFAULT_ADDRESS,
+                        help=f"host:port or unix:<path> (default {DEFAULT_ADDRESS})")
+    args = parser.parse_args(argv)
+    try:
+        view(args.address)
+    except OSError as error:
+        print(f"could not watch {args.address}: {error}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Pre-rendered sprite cache
+
+Characters are drawn with many pygame.draw calls. The cache renders each
+distinct visual state once into a Surface, keyed by the caller, and hands the
+same Surface back on later frames so drawing becomes a single blit. It is
+bounded and evicts the least recently used sprite when full.
+
+MaskCache builds collision masks from the same sprites, so pixel-perfect
+collision matches exactly what is drawn.
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+
+class SpriteCache:
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._sprites = OrderedDict()
+
+    def get(self, key, size, render, *args):
+        """Return the sprite for `key`, calling render(surface, *args) to draw it on a miss"""
+        sprite = self.lookup(key)
+        if sprite is None:
+            sprite = pygame.Surface(size, pygame.SRCALPHA)
+            render(sprite, *args)
+            sprite = self.store(key, sprite)
+        return sprite
+
+    def lookup(self, key):
+        """Return the cached sprite for `key`, or None"""
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._sprites.move_to_end(key)
+        return sprite
+
+    def store(self, key, sprite):
+        """Add an already rendered sprite, evicting the oldest if full"""
+        if pygame.display.get_surface() is not None:
+            # Match the display's pixel format for faster blits
+            sprite = sprite.convert_alpha()
+
+        self._sprites[key] = sprite
+        if len(self._sprites) > self.max_entries:
+            self._sprites.popitem(last=False)
+        return sprite
+
+    def clear(self):
+        self._sprites.clear()
+
+    def __len__(self):
+        return len(self._sprites)
+
+
+class MaskCache:
+    def __init__(self, sprites, max_entries=256):
+        self.sprites = sprites
+        self.max_entries = max_entries
+        self._masks = OrderedDict()
+
+    def get(self, key, size, render, *args):
+        """Return (mask, bounds) for the sprite `key`, rendering it through the sprite cache on a miss
+
+        bounds is the Rect of the mask's set pixels, relative to the sprite.
+        """
+        entry = self._masks.get(key)
+        if entry is not None:
+            self._masks.move_to_end(key)
+            return entry
+
+        mask = pygame.mask.from_surface(self.sprites.get(key, size, render, *args))
+        rects = mask.get_bounding_rects()
+        bounds = rects[0].unionall(rects[1:]) if rects else pygame.Rect(0, 0, 0, 0)
+        entry = (mask, bounds)
+        self._masks[key] = entry
+        if len(self._masks) > self.max_entries:
+            self._masks.popitem(last=False)
+        return entry
+
+    def clear(self):
+        self._masks.clear()
+
+    def __len__(self):
+        return len(self._masks)
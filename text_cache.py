@@ -0,0 +1,57 @@
+"""
+Text rendering cache for the HUD and game over screens
+
+Strings that do not change between frames are rasterised once and kept in a
+bounded cache. Changing numbers are composed from a per-font digit atlas:
+the label is a cached surface and each digit is a pre-rendered glyph, so
+font rasterisation only happens the first time a string or font is seen.
+"""
+
+import pygame
+
+from sprite_cache import SpriteCache
+
+DIGITS = '0123456789.-'
+
+
+class TextCache:
+    def __init__(self, max_entries=128):
+        self.cache = SpriteCache(max_entries)
+        self._atlases = {}
+
+    def render(self, font, text, color):
+        """Rendered surface for a string, rasterised only on first use"""
+        key = (font, text, color)
+        surface = self.cache.lookup(key)
+        if surface is None:
+            surface = self.cache.store(key, font.render(text, True, color))
+        return surface
+
+    def atlas(self, font, color):
+        """Pre-rendered digit glyphs for a font and colour"""
+        key = (font, color)
+        glyphs = self._atlases.get(key)
+        if glyphs is None:
+            glyphs = {char: font.render(char, True, color) for char in DIGITS}
+            self._atlases[key] = glyphs
+        return glyphs
+
+    def draw(self, screen, font, label, number, color, topleft=None, center=None):
+        """Draw `label` followed by `number` (a string of digits); returns the rect drawn to"""
+        glyphs = self.atlas(font, color)
+        label_surface = self.render(font, label, color)
+        width = label_surface.get_width() + sum(glyphs[char].get_width() for char in number)
+        rect = pygame.Rect(0, 0, width, label_surface.get_height())
+        if center is not None:
+            rect.center = center
+        else:
+            rect.topleft = topleft
+
+        x = rect.x + label_surface.get_width()
+        blits = [(label_surface, rect.topleft)]
+        for char in number:
+            glyph = glyphs[char]
+            blits.append((glyph, (x, rect.y)))
+            x += glyph.get_width()
+        screen.blits(blits, False)
+        return rect